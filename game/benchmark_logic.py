@@ -0,0 +1,229 @@
+"""
+Scaling benchmark for the sorting logic
+Generates synthetic catalogs in the game_images.json schema (10^3 to 10^7 books)
+and times the library_game_logic functions at each size
+
+Usage (from game/):
+    python benchmark_logic.py                      # 10^3 .. 10^6 books
+    python benchmark_logic.py --max-exp 7          # up to 10^7 books
+    python benchmark_logic.py --format json -o bench.json
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+from library_game_logic import (
+    load_books_by_genre, sort_books_by_surname, sort_books_by_first_name, check_book_position
+)
+from src.catalog import BookCatalog, set_catalog
+from src.shelf_index import ShelfIndex
+
+
+FIRST_NAMES = [
+    "Jane", "Emily", "Charles", "Megan", "Stephen", "Agatha", "George", "Mary", "John", "Sarah",
+    "Ursula", "Daphne", "Gabriel", "Toni", "James", "Colleen", "Ruth", "Lee", "Nora", "Taylor",
+    "Ana", "José", "Zoë", "Chloé", "Mark", "Anne", "Rachel", "Simone", "Jorge Luis", "F. Scott",
+    "Emma", "Olivia", "Liam", "Noah", "Amelia", "Sophia", "Lucas", "Mateo", "Elena", "Isabel",
+]
+SURNAMES = [
+    "Smith", "Johnson", "Brown", "Williams", "Jones", "Garcia", "Miller", "Davis", "Abbott", "Austen",
+    "Brontë", "Dickens", "King", "Christie", "Orwell", "Shelley", "Hoover", "Henry", "Roberts", "Child",
+    "Le Guin", "du Maurier", "García Márquez", "van Dyke", "de la Cruz", "St. James", "O'Brien",
+    "McDonald", "MacLeod", "Müller", "Nuñez", "Øster", "Ware", "Hawkins", "Flynn", "Moriarty",
+]
+SYLLABLES = ["an", "bel", "cor", "dal", "en", "far", "gar", "hol", "ing", "jor", "kel", "lan",
+             "mor", "nor", "ost", "par", "quin", "ros", "sten", "tor", "ul", "ver", "wick", "yor"]
+TITLE_WORDS = ["Shadow", "Love", "House", "Night", "Secret", "Girl", "Summer", "Lake", "Last",
+               "Wild", "Silent", "Garden", "Winter", "Promise", "Road", "Letter", "Fire", "Sea"]
+GENRES = ["Classic", "Romance", "Thriller"]
+
+# Growth exponent above which a function is flagged as super-linear;
+# n log n between two decades stays below ~1.1
+SUPERLINEAR_EXPONENT = 1.25
+# Timings shorter than this are dominated by noise and never flagged
+MIN_FLAG_SECONDS = 0.005
+
+
+def zipf_weights(count, exponent=1.1):
+    """Zipf-like weights so a few names are very common and most are rare."""
+    return [1.0 / (rank + 1) ** exponent for rank in range(count)]
+
+
+def synthetic_surnames(rng, count):
+    """Common surnames followed by generated ones, so large catalogs keep duplicates and variety."""
+    names = list(SURNAMES)
+    while len(names) < count:
+        parts = rng.randint(2, 3)
+        names.append("".join(rng.choice(SYLLABLES) for _ in range(parts)).capitalize())
+    return names
+
+
+def generate_catalog(size, seed=0):
+    """
+    Generate a synthetic book database in the game_images.json schema.
+
+    Args:
+        size (int): Number of books
+        seed (int): Random seed
+
+    Returns:
+        tuple: (records list, local cover mapping dict)
+    """
+    rng = random.Random(seed)
+    surnames = synthetic_surnames(rng, max(len(SURNAMES), int(size ** 0.6)))
+    surname_weights = zipf_weights(len(surnames))
+    first_weights = zipf_weights(len(FIRST_NAMES), 0.8)
+
+    first_picks = rng.choices(FIRST_NAMES, weights=first_weights, k=size)
+    surname_picks = rng.choices(surnames, weights=surname_weights, k=size)
+    genre_picks = rng.choices(GENRES, weights=[1, 4, 5], k=size)
+
+    records = []
+    covers = {}
+    for i in range(size):
+        title = f"The {rng.choice(TITLE_WORDS)} {rng.choice(TITLE_WORDS)} {i}"
+        records.append({
+            "title": title,
+            "Genre": genre_picks[i],
+            "Large_Image_URL": "",
+            "author first name": first_picks[i],
+            "author surname": surname_picks[i],
+            "rank": 0,
+        })
+        covers[title] = {"Local_Path": f"game_images/book_{i}.jpg", "Genre": genre_picks[i]}
+
+    records.sort(key=lambda r: (r["author surname"], r["author first name"]))
+    for rank, record in enumerate(records, start=1):
+        record["rank"] = rank
+    rng.shuffle(records)
+    return records, covers
+
+
+def time_call(func, repeat=3):
+    """Return the best wall time of `repeat` calls to func()."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_size(size, workdir, seed=0, genre="thriller"):
+    """
+    Time every logic function on one synthetic catalog.
+
+    Returns:
+        list: Result rows (dicts) for this size
+    """
+    records, covers = generate_catalog(size, seed)
+    game_images_path = os.path.join(workdir, f"game_images_{size}.json")
+    local_images_path = os.path.join(workdir, f"local_game_images_{size}.json")
+    with open(game_images_path, "w") as f:
+        json.dump(records, f)
+    with open(local_images_path, "w") as f:
+        json.dump(covers, f)
+    del records, covers
+
+    rows = []
+
+    def record(name, seconds, items):
+        rows.append({"function": name, "n": items, "seconds": seconds})
+
+    start = time.perf_counter()
+    catalog = BookCatalog.from_json(game_images_path, local_images_path)
+    record("catalog_load", time.perf_counter() - start, len(catalog))
+    set_catalog(catalog)
+
+    start = time.perf_counter()
+    books = load_books_by_genre(genre)
+    record("load_books_by_genre (first)", time.perf_counter() - start, len(catalog))
+    record("load_books_by_genre (cached)", time_call(lambda: load_books_by_genre(genre)), len(catalog))
+
+    record("sort_books_by_surname", time_call(lambda: sort_books_by_surname(books)), len(books))
+    record("sort_books_by_first_name", time_call(lambda: sort_books_by_first_name(books)), len(books))
+
+    shelf, new_book = books[:-1], books[-1]
+    record("check_book_position (list)", time_call(lambda: check_book_position(new_book, shelf)), len(shelf))
+    index = ShelfIndex(shelf)
+    record("check_book_position (ShelfIndex)",
+           time_call(lambda: check_book_position(new_book, index)), len(shelf))
+
+    set_catalog(None)
+    os.remove(game_images_path)
+    os.remove(local_images_path)
+    return rows
+
+
+def add_growth(rows):
+    """
+    Add the empirical growth exponent (log-log slope versus the previous size)
+    to each row and flag functions that grow faster than n log n.
+    """
+    previous = {}
+    for row in rows:
+        prior = previous.get(row["function"])
+        row["exponent"] = ""
+        row["flag"] = ""
+        if prior and prior["n"] > 0 and row["n"] > prior["n"] and prior["seconds"] > 0 and row["seconds"] > 0:
+            exponent = math.log(row["seconds"] / prior["seconds"]) / math.log(row["n"] / prior["n"])
+            row["exponent"] = round(exponent, 3)
+            if exponent > SUPERLINEAR_EXPONENT and prior["seconds"] >= MIN_FLAG_SECONDS:
+                row["flag"] = "SUPERLINEAR"
+        row["ns_per_item"] = round(row["seconds"] * 1e9 / max(row["n"], 1), 1)
+        previous[row["function"]] = row
+    return rows
+
+
+def write_results(rows, fmt, stream):
+    """Write the result table as CSV or JSON."""
+    if fmt == "json":
+        json.dump(rows, stream, indent=2)
+        stream.write("\n")
+        return
+    writer = csv.DictWriter(stream, fieldnames=["function", "n", "seconds", "ns_per_item", "exponent", "flag"])
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main(argv=None):
+    """Run the scaling benchmark and print the results table."""
+    parser = argparse.ArgumentParser(description="Scaling benchmark for library_game_logic")
+    parser.add_argument("--min-exp", type=int, default=3, help="smallest catalog is 10^min-exp books")
+    parser.add_argument("--max-exp", type=int, default=6, help="largest catalog is 10^max-exp books")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=["csv", "json"], default="csv")
+    parser.add_argument("-o", "--output", help="write results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="dewey_bench_") as workdir:
+        for exp in range(args.min_exp, args.max_exp + 1):
+            size = 10 ** exp
+            print(f"[Benchmark] {size} books...", file=sys.stderr)
+            rows.extend(benchmark_size(size, workdir, seed=args.seed))
+
+    rows.sort(key=lambda row: (row["function"], row["n"]))
+    add_growth(rows)
+
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            write_results(rows, args.format, f)
+    else:
+        write_results(rows, args.format, sys.stdout)
+
+    flagged = sorted({row["function"] for row in rows if row["flag"]})
+    if flagged:
+        print(f"[Benchmark] Super-linear growth: {', '.join(flagged)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,43 @@
 import random
-import os
-import json
+
+from src.catalog import get_catalog
+from src.names import parse_author_name
+from src.shelf_index import ShelfIndex
+from src.sort_rules import get_sort_rule
+from src.catalog_stream import iter_books_by_genre
 
 def get_author_surname(author):
     """
     Extract the surname (last name) from an author's full name.
+    Keeps surname particles and drops suffixes: "Ursula K. Le Guin" -> "Le Guin".
     """
-    return author.split()[-1]
+    return parse_author_name(author).surname
 
 def get_author_first_name(author):
     """
     Extract the first name from an author's full name.
     """
-    return author.split()[0]
+    return parse_author_name(author).first_name
+
+def sort_books(books, sort_by='surname'):
+    """
+    Sort a list of books with a registered sort rule ('surname', 'first_name', 'title', ...).
+    Compares the rule's precomputed keys; see src/sort_rules.py.
+    """
+    rule = get_sort_rule(sort_by)
+    return sorted(books, key=rule.key)
 
 def sort_books_by_surname(books):
     """
     Sort a list of books alphabetically by author's surname (last name).
     """
-    return sorted(books, key=lambda x: get_author_surname(x[1]))
+    return sort_books(books, 'surname')
 
 def sort_books_by_first_name(books):
     """
     Sort a list of books alphabetically by author's first name.
     """
-    return sorted(books, key=lambda x: get_author_first_name(x[1]))
+    return sort_books(books, 'first_name')
 
 def check_book_position(book, shelf_books, sort_by='surname'):
     """
@@ -32,54 +45,46 @@ def check_book_position(book, shelf_books, sort_by='surname'):
     
     Args:
         book: The book to place (title, author, color)
-        shelf_books: Current books on shelf
-        sort_by: 'surname' or 'first_name'
+        shelf_books: Current books on shelf (a list or a ShelfIndex)
+        sort_by: Name of a registered sort rule ('surname', 'first_name', ...)
     
     Returns:
         int: Correct index position
     """
-    temp_list = shelf_books + [book]
+    if isinstance(shelf_books, ShelfIndex) and shelf_books.sort_by == sort_by:
+        return shelf_books.slot_for(book)
+
+    # Plain list: count the books that sort at or before the new one,
+    # which is where a stable sort of shelf_books + [book] would put it
+    rule = get_sort_rule(sort_by)
+    key = rule.key(book)
+    return sum(1 for other in shelf_books if rule.key(other) <= key)
+
+def grade_orderings_file(path, sort_by='surname'):
+    """
+    Grade a file of proposed shelf orderings in one vectorized batch.
     
-    if sort_by == 'first_name':
-        sorted_list = sort_books_by_first_name(temp_list)
-    else:
-        sorted_list = sort_books_by_surname(temp_list)
+    Args:
+        path: CSV (attempt_id,title,...) or JSONL ({"id": ..., "order": [...]}) file
+        sort_by: Name of a registered sort rule
     
-    return sorted_list.index(book)
+    Returns:
+        list: One result dict per attempt (exact match, inversions, partial-credit score)
+    """
+    # NumPy is only needed for batch grading, not for playing the game
+    from src.grading import grade_orderings, read_orderings
+    return grade_orderings(read_orderings(path), sort_by=sort_by)
 
 def load_books_by_genre(genre):
     """
-    Load book data for a specific genre, including rank, from a list-based JSON structure.
+    Load book data for a specific genre from the shared catalog.
+    The catalog parses the JSON database once per process; see src/catalog.py.
     """
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Path to game_images.json (now a list of book dictionaries, includes rank)
-    game_images_json_path = os.path.join(script_dir, "..", "artifacts", "book_covers", "game_images.json")
+    return list(get_catalog().books_by_genre(genre))
 
-    all_books_raw_list = [] # It's a list now
-    try:
-        with open(game_images_json_path, "r") as f:
-            all_books_raw_list = json.load(f) # Loads a list
-    except FileNotFoundError:
-        print(f"Error: game_images.json not found at {game_images_json_path}")
-        return []
-    
-    genre_colors = {
-        'classic': "#e8d5b7",
-        'romance': "#ffb6c1",
-        'thriller': "#3d2817"
-    }
-    default_color = genre_colors.get(genre, "#cccccc")
-
-    filtered_books = []
-    for book_data in all_books_raw_list: # Iterate the list
-        if book_data.get("Genre") and book_data["Genre"].lower() == genre.lower():
-            title = book_data.get("title")
-            author_first = book_data.get("author first name", "")
-            author_surname = book_data.get("author surname", "")
-            full_author = f"{author_first} {author_surname}".strip() # Construct full name
-            color = genre_colors.get(book_data["Genre"].lower(), default_color)
-            # Note: We're NOT using rank anymore, just (title, author, color)
-            filtered_books.append((title, full_author, color))
-            
-    return filtered_books
+def stream_books_by_genre(genre):
+    """
+    Stream (title, author, color) books of one genre straight from the JSON file.
+    Memory stays bounded regardless of file size; see src/catalog_stream.py.
+    """
+    return iter_books_by_genre(genre)
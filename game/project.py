@@ -1,20 +1,34 @@
+import time
+STARTUP_T0 = time.perf_counter()  # before any heavy import, for the time-to-first-frame report
+
 import tkinter as tk
-from tkinter import messagebox
-import random
-import json
 import os
-import PIL
-from PIL import Image, ImageDraw, ImageFont, ImageTk
-from library_game_logic import get_author_surname, get_author_first_name, check_book_position, load_books_by_genre, sort_books_by_surname, sort_books_by_first_name
-
-# Import enhancement modules from src folder
-from src.notifications import show_geese_popup_overlay, show_librarian_angry_overlay
-from src.progress_tracker import load_progress, save_progress, mark_genre_complete, create_completion_badge
-from src.end_screen import show_enhanced_end_screen
+from PIL import Image, ImageDraw, ImageTk
+
+# Only what the title and story screens need is imported up front
 from src.reset_progress import confirm_reset, reset_all_progress, show_reset_success
-from src.gamebackground import backgroundhandler
-from src.bookspines import calculate_book_dimensions, create_book_spine_image
-from src.drag_logic import DragManager
+from src.gamebackground import backgroundhandler, get_pyramid, preload_pyramids
+from src.resize_scheduler import ResizeScheduler
+
+# Gameplay-only modules (catalog, spines, drag logic, covers, popups, end screen),
+# bound by import_gameplay_modules() once the title screen is up
+library_game_logic = bookspines = catalog = cover_atlas = cover_cache = cover_prefetch = None
+drag_logic = end_screen = fonts = notifications = progress_tracker = rounds = None
+shelf_index = shelf_renderer = sort_rules = spine_geometry = None
+
+
+GAMEPLAY_PRELOAD_MS = 200  # load gameplay subsystems this long after the title screen is up
+
+
+def import_gameplay_modules():
+    """Import the gameplay-only modules and bind them as globals of this module."""
+    global library_game_logic, bookspines, catalog, cover_atlas, cover_cache, cover_prefetch
+    global drag_logic, end_screen, fonts, notifications, progress_tracker, rounds
+    global shelf_index, shelf_renderer, sort_rules, spine_geometry
+    import library_game_logic
+    from src import (bookspines, catalog, cover_atlas, cover_cache, cover_prefetch, drag_logic,
+                     end_screen, fonts, notifications, progress_tracker, rounds, shelf_index,
+                     shelf_renderer, sort_rules, spine_geometry)
 
 
 class LibraryGame:
@@ -36,18 +50,68 @@ class LibraryGame:
         self.score = 0
         self.current_book_index = 0
         self.total_books = 5
-        self.genre_progress = load_progress()
-        self.sort_method = 'surname'  # Will be 'surname' or 'first_name'
-        
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(script_dir, "..", "artifacts", "book_covers", "local_game_images.json")
-        with open(json_path, "r") as f:
-            full_book_data = json.load(f)
-        
-        self.book_cover_paths = {title: details["Local_Path"] for title, details in full_book_data.items()}
+        self._genre_progress = None  # read from disk on first use (see genre_progress)
+        self.sort_method = 'surname'  # Any rule registered in src/sort_rules.py
+        self.difficulty = 'normal'  # 'easy', 'normal' or 'hard' (see src/rounds.py)
+        self.use_shelf_layer = False  # True: draw the shelf as one layer (src/shelf_renderer.py)
+        self.shelf_renderer = None
+        self.cover_photo = None
+        self.spine_photos = {}
+        
+        # Catalog, puzzle bank, cover caches and popup sprites: see load_gameplay()
+        self.gameplay_loaded = False
+        self.root.after(GAMEPLAY_PRELOAD_MS, self.load_gameplay)
         self.show_title_screen()
 
+    @property
+    def genre_progress(self):
+        """Saved genre progress, read from disk the first time it is needed."""
+        if self._genre_progress is None:
+            from src.progress_tracker import load_progress
+            self._genre_progress = load_progress()
+        return self._genre_progress
+
+    @genre_progress.setter
+    def genre_progress(self, progress):
+        self._genre_progress = progress
+
+    def load_gameplay(self):
+        """
+        Import the gameplay modules and build the catalog-backed subsystems, once.
+        Runs shortly after the title screen is up, or on demand if a round starts first.
+        """
+        if self.gameplay_loaded:
+            return
+        started = time.perf_counter()
+        import_gameplay_modules()
+
+        # Read saved progress now rather than on the mode-select slide
+        self._genre_progress = self._genre_progress or progress_tracker.load_progress()
+        # Shared catalog: both JSON files are parsed once per process
+        self.catalog = catalog.get_catalog()
+        # Rounds are pre-generated in the background once the UI is idle
+        self.puzzle_bank = rounds.PuzzleBank(per_key=8)
+        # Decoded, resized covers keyed by (title, size); the current cover's
+        # PhotoImage is kept so redraws after a failed drop reuse it
+        self.cover_cache = cover_cache.CoverCache()
+        self.cover_atlas = cover_atlas.CoverAtlas.open()  # None until `python -m src.cover_atlas` has been run
+        self.cover_prefetcher = cover_prefetch.CoverPrefetcher(self.root, self.cover_cache, self.load_book_cover)
+        self.gameplay_loaded = True
+        print(f"[Startup] Gameplay loaded in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        self.root.after_idle(lambda: self.puzzle_bank.start(sort_rules=(self.sort_method,),
+                                                            difficulties=(self.difficulty,)))
+        # Spine geometry is solved per genre while the title screen is up
+        for genre in ('classic', 'romance', 'thriller'):
+            self.root.after_idle(lambda genre=genre: spine_geometry.spine_geometry_table(genre, self.catalog))
+        # Popup sprites are decoded once, before the first answer
+        notifications.warm_up_sprites(self.root)
+
     def clear_screen(self):
+        # Pending resize redraws must not run against the screen being torn down
+        for resizer in (getattr(self, 'title_resizer', None), getattr(self, 'story_resizer', None)):
+            if resizer is not None:
+                resizer.cancel()
         for widget in self.root.winfo_children():
             widget.destroy()
     
@@ -78,8 +142,11 @@ class LibraryGame:
         image_path = os.path.join(script_dir, "..", "artifacts", "startgame.png")
         
         try:
-            self.original_title_image = Image.open(image_path)
-            self.title_screen_image = None # To be created on resize
+            self.title_pyramid = get_pyramid(image_path)
+            self.original_title_image = self.title_pyramid.image
+            # One image item, redrawn with a fast filter while resizing and LANCZOS once settled
+            self.title_resizer = ResizeScheduler(self.root, self.canvas, self.title_pyramid,
+                                                 on_layout=self.layout_title_screen)
             self.canvas.bind('<Configure>', self.on_resize_title_screen)
         except FileNotFoundError:
             pass
@@ -110,17 +177,11 @@ class LibraryGame:
         self.reset_btn_window = self.canvas.create_window(0, 0, window=self.reset_btn, anchor='nw')
 
     def on_resize_title_screen(self, event):
-        if not hasattr(self, 'original_title_image'):
+        if not hasattr(self, 'title_resizer'):
             return
-            
-        new_width = event.width
-        new_height = event.height
-        
-        # Resize image
-        resized_img = self.original_title_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        self.title_screen_image = ImageTk.PhotoImage(resized_img)
-        self.canvas.create_image(0, 0, image=self.title_screen_image, anchor='nw')
-        
+        self.title_resizer.schedule(event)
+
+    def layout_title_screen(self, new_width, new_height):
         # Scale and reposition button
         scale_factor_width = new_width / self.base_window_width
         scale_factor_height = new_height / self.base_window_height
@@ -160,6 +221,10 @@ class LibraryGame:
             "artifacts/story/2angrylibrarian.png",
             "artifacts/story/3modeselect.png"
         ])
+        # Decode every slide in the background; the pyramids stay cached across visits
+        self.story_preload = preload_pyramids(
+            [self.story_image_path(index) for index in range(len(self.story_images))],
+            (self.root.winfo_width(), self.root.winfo_height()))
         
         self.story_canvas = tk.Canvas(self.root, bg="#f5f0e8", highlightthickness=0)
         self.story_canvas.pack(fill=tk.BOTH, expand=True)
@@ -187,35 +252,30 @@ class LibraryGame:
             )
             back_btn.place(relx=0, rely=0, anchor='nw')
 
+        # Keep buttons on top of the slide after every redraw
+        self.story_resizer = ResizeScheduler(self.root, self.story_canvas,
+                                             on_layout=lambda width, height: self.story_canvas.tag_raise("button"))
         self.story_canvas.bind('<Configure>', self.on_resize_story_screen)
         self.display_story_page()
     
     def on_resize_story_screen(self, event):
-        if not hasattr(self, 'original_story_image'):
-            return
-            
-        new_width = event.width
-        new_height = event.height
-        
-        # Resize image
-        resized_img = self.original_story_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        self.story_screen_image = ImageTk.PhotoImage(resized_img)
-        self.story_canvas.create_image(0, 0, image=self.story_screen_image, anchor='nw')
-        
-        # Keep buttons on top
-        self.story_canvas.tag_raise("button")
+        self.story_resizer.schedule(event)
+
+    def story_image_path(self, index):
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        return os.path.join(script_dir, "..", self.story_images[index])
  
     def display_story_page(self):
         self.story_canvas.delete("all")
         
         if self.story_index < len(self.story_images):
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            image_path = os.path.join(script_dir, "..", self.story_images[self.story_index])
+            image_path = self.story_image_path(self.story_index)
             
             try:
-                self.original_story_image = Image.open(image_path)
-                # Trigger the resize event manually to draw the first image
-                self.on_resize_story_screen(type('event', (object,), {'width': self.root.winfo_width(), 'height': self.root.winfo_height()}))
+                story_pyramid = get_pyramid(image_path)
+                self.original_story_image = story_pyramid.image
+                # Draw the first image right away at the current window size
+                self.story_resizer.set_pyramid(story_pyramid, (self.root.winfo_width(), self.root.winfo_height()))
             except FileNotFoundError:
                 # Handle missing image file
                 self.story_canvas.create_text(self.root.winfo_width() / 2, self.root.winfo_height() / 2, text=f"Image not found:\n{image_path}", font=("Georgia", 18))
@@ -324,27 +384,30 @@ class LibraryGame:
 # ====================================================================================================================
 
     def start_game_with_genre(self, genre):
+        self.load_gameplay()
         self.selected_genre = genre
         
-        self.books_pool = load_books_by_genre(genre).copy()
-        random.shuffle(self.books_pool)
-        
-        self.books_to_place = self.books_pool[:self.total_books]
-        remaining = self.books_pool[self.total_books:]
-        shelf_books_unsorted = random.sample(remaining, min(4, len(remaining)))
+        # Pre-generated round from the bank (sampled by book ID, no pool copies)
+        self.current_round = self.puzzle_bank.take(genre, self.sort_method, self.difficulty)
+        self.books_to_place = [self.catalog.book(book_id) for book_id in self.current_round.place_ids]
+        shelf_books_unsorted = [self.catalog.book(book_id) for book_id in self.current_round.shelf_ids]
         
-        self.shelf_books = sort_books_by_surname(shelf_books_unsorted)
+        # The index keeps shelf_books sorted; self.shelf_books is its live list
+        self.shelf = shelf_index.ShelfIndex(shelf_books_unsorted, sort_by=self.sort_method)
+        self.shelf_books = self.shelf.books
         
         self.current_book_index = 0
         self.score = 0       
+        self.spine_photos.clear()
     
         self.show_game_screen()
     
     def show_game_screen(self):
         self.clear_screen()
         self.current_screen = "game"
+        self.load_gameplay()
         self.setup_game_ui()
-        self.drag_manager = DragManager(self)
+        self.drag_manager = drag_logic.DragManager(self)
         self.draw_game()
         # Create Home button locally
         home_btn = tk.Button(
@@ -389,6 +452,9 @@ class LibraryGame:
         self.selected_slot = None
         self.book_images = []
         self.shelf_y = 530  # Updated shelf height for background image
+        # Optional: the whole shelf as one composited canvas item
+        self.shelf_renderer = (shelf_renderer.ShelfRenderer(self.main_canvas, 1150, 0, self.shelf_y)
+                               if self.use_shelf_layer else None)
         
         # Initialize background handler (Hannah's module)
         self.bg_handler = backgroundhandler(self.main_canvas, 1150, 650)
@@ -397,6 +463,8 @@ class LibraryGame:
             self.main_canvas.bind('<Configure>', lambda e: self.bg_handler.on_resize(e))
         else:
             self.bg_handler.create_fallback_background()
+        # Popups are built once per canvas, hidden, and only shown per answer
+        self.root.after_idle(lambda canvas=self.main_canvas: canvas.winfo_exists() and notifications.prepare_popup_overlays(canvas))
     
     def draw_game(self):
         # Redisplay background (Hannah's module)
@@ -414,7 +482,7 @@ class LibraryGame:
             title, author, color = current_book 
             
             self.instruction_label.config(
-                text=f"Drag '{title}' by {author} from the trolley to the correct spot!\n(Books are sorted alphabetically by author's surname)"
+                text=f"Drag '{title}' by {author} from the trolley to the correct spot!\n(Books are sorted {sort_rules.get_sort_rule(self.sort_method).instruction})"
             )
             self.progress_label.config(text=f"Book: {self.current_book_index + 1}/{self.total_books}")
     
@@ -437,19 +505,17 @@ class LibraryGame:
         # Unpack the 3-element tuple (no rank)
         title, author, color = self.books_to_place[self.current_book_index] 
         
-        image_path = self.book_cover_paths.get(title)
-        
-        if image_path:
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            full_image_path = os.path.join(script_dir, "..", "artifacts", "book_covers", image_path)
-            try:
-                img = Image.open(full_image_path)
-                img = img.resize((book_width, book_height), Image.Resampling.LANCZOS)
-                book_img = ImageTk.PhotoImage(img)
-            except FileNotFoundError:
-                book_img = self.create_pretty_book_cover(book_width, book_height, title, author, color)
+        size = (book_width, book_height)
+        if self.cover_photo is not None and self.cover_photo[0] == (title, size):
+            book_img = self.cover_photo[1]
         else:
-            book_img = self.create_pretty_book_cover(book_width, book_height, title, author, color)
+            img = self.cover_cache.get_or_load(
+                title, size, lambda: self.wait_for_book_cover(title, author, color, size))
+            book_img = ImageTk.PhotoImage(img)
+            self.cover_photo = ((title, size), book_img)
+        self.prefetch_upcoming_covers(size)
+        if self.current_book_index == len(self.books_to_place) - 1:
+            self.prefetch_end_screen()
 
         self.book_images.append(book_img)
         self.main_canvas.create_image(x, y, image=book_img, anchor='nw', tags="draggable")
@@ -462,19 +528,61 @@ class LibraryGame:
         
         self.drag_book_info = {'width': book_width, 'height': book_height, 'x': x, 'y': y}
     
+    def prefetch_upcoming_covers(self, size):
+        """Decode the next covers (and the next round's first cover, for "Try Again") off the main thread."""
+        start = self.current_book_index + 1
+        upcoming = self.books_to_place[start:start + cover_prefetch.PREFETCH_AHEAD]
+        if len(upcoming) < cover_prefetch.PREFETCH_AHEAD:
+            next_round = self.puzzle_bank.peek(self.selected_genre, self.sort_method, self.difficulty)
+            if next_round is not None and next_round.place_ids:
+                upcoming.append(self.catalog.book(next_round.place_ids[0]))
+        self.cover_prefetcher.prefetch(upcoming, size)
+
+    def prefetch_end_screen(self):
+        """Compose the end-screen background this round will lead to while the last book is placed."""
+        progress = {genre: dict(state) for genre, state in self.genre_progress.items()}
+        if self.selected_genre in progress:
+            progress[self.selected_genre]['completed'] = True
+        w, h = self.root.winfo_width(), self.root.winfo_height()
+        if w < 100:  # same fallback size as the end screen
+            w, h = 900, 675
+        end_screen.prefetch_end_background(progress, (w, h))
+
+    def wait_for_book_cover(self, title, author, color, size):
+        """Use an in-flight prefetch of this cover if there is one, else load it now."""
+        img = self.cover_prefetcher.wait(title, size)
+        if img is None:
+            img = self.load_book_cover(title, author, color, size)
+        return img
+
+    def load_book_cover(self, title, author, color, size):
+        """Crop a book's cover from the atlas, decode and resize it, or render the fallback cover."""
+        if self.cover_atlas is not None and tuple(size) == self.cover_atlas.tile_size:
+            img = self.cover_atlas.cover(title)
+            if img is not None:
+                return img
+        image_path = self.catalog.cover_path(title)
+        if image_path:
+            script_dir = os.path.dirname(os.path.abspath(__file__))
+            full_image_path = os.path.join(script_dir, "..", "artifacts", "book_covers", image_path)
+            try:
+                return cover_cache.load_cover(full_image_path, size)
+            except FileNotFoundError:
+                pass
+        return self.render_pretty_book_cover(size[0], size[1], title, author, color)
+
     def create_pretty_book_cover(self, width, height, title, author, base_color):
+        return ImageTk.PhotoImage(self.render_pretty_book_cover(width, height, title, author, base_color))
+
+    def render_pretty_book_cover(self, width, height, title, author, base_color):
         img = Image.new('RGB', (width, height), base_color)
         draw = ImageDraw.Draw(img)
         
         draw.rectangle([0, 0, width-1, height-1], outline='#2c1810', width=3)
         draw.rectangle([5, 5, width-6, height-6], outline='white', width=2)
         
-        try:
-            title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 11)
-            author_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 8)
-        except:
-            title_font = ImageFont.load_default()
-            author_font = ImageFont.load_default()
+        title_font = fonts.get_font('regular', 11)
+        author_font = fonts.get_font('regular', 8)
         
         title_words = title.split()
         if len(title) > 15:
@@ -488,12 +596,14 @@ class LibraryGame:
         
         draw.text((width//2, height - 15), author, fill='white', font=author_font, anchor='mm')
         
-        return ImageTk.PhotoImage(img)
+        return img
     
     def draw_bookshelf(self):
         canvas_width = 1150
         spacing = 10
-        book_widths = [random.randint(60, 90) for _ in self.shelf_books]
+        # Stable per-book (width, height, font_size) from the catalog's geometry table
+        geometries = [spine_geometry.book_spine_geometry(book, self.catalog) for book in self.shelf_books]
+        book_widths = [width for width, _, _ in geometries]
         total_width = sum(book_widths) + (len(self.shelf_books) - 1) * spacing
         start_x = (canvas_width - total_width) // 2
         
@@ -515,8 +625,7 @@ class LibraryGame:
         
         current_x = start_x
         for i, (title, author, color) in enumerate(self.shelf_books):
-            book_width = book_widths[i]
-            book_height, font_size = self.calculate_book_dimensions(title, author, book_width)
+            book_width, book_height, font_size = geometries[i]
             y = self.shelf_y - book_height
             
             self.book_labels.append({
@@ -525,19 +634,24 @@ class LibraryGame:
                 'title': title, 'author': author, 'color': color, 'font_size': font_size
             })
             
-            self.draw_book_spine(i, current_x, y, book_width, book_height, color, title, author, font_size)
+            if self.shelf_renderer is None:
+                self.draw_book_spine(i, current_x, y, book_width, book_height, color, title, author, font_size)
             current_x += book_width + spacing
+        
+        if self.shelf_renderer is not None:
+            self.shelf_renderer.update(self.book_labels)
     
-    def calculate_book_dimensions(self, title, author, width):
-        return calculate_book_dimensions(title, author, width)
-
     def draw_book_spine(self, index, x, y, width, height, color, title, author, font_size):
-        book_img = self.create_book_spine_image(width, height, color, title, author, font_size)
+        # PhotoImages are memoized per spine so redraws reuse the rendered spine
+        key = (width, height, color, title, author, font_size)
+        book_img = self.spine_photos.get(key)
+        if book_img is None:
+            book_img = self.spine_photos[key] = self.create_book_spine_image(*key)
         self.book_images.append(book_img)
         self.main_canvas.create_image(x, y, image=book_img, anchor='nw', tags=f"book_{index}")
     
     def create_book_spine_image(self, width, height, color, title, author, font_size):
-        return create_book_spine_image(width, height, color, title, author, font_size)
+        return bookspines.create_book_spine_image(width, height, color, title, author, font_size)
 
 # ------------------- score decision and actions -----------------------------------------------
     
@@ -546,23 +660,23 @@ class LibraryGame:
             return
         
         current_book = self.books_to_place[self.current_book_index]
-        correct_position = check_book_position(current_book, self.shelf_books, sort_by=self.sort_method)
+        correct_position = library_game_logic.check_book_position(current_book, self.shelf, sort_by=self.sort_method)
         
         if self.selected_slot == correct_position:
             self.score += 10
-            self.shelf_books.insert(correct_position, current_book)
+            self.shelf.insert(current_book)
             # Show overlay on the game canvas
-            show_geese_popup_overlay(self.main_canvas, self.root, self.score, 
+            notifications.show_geese_popup_overlay(self.main_canvas, self.root, self.score, 
                                     "Perfect! You sorted it correctly! 🪿",
                                     on_close=self.continue_after_popup)
 
         else:
-            temp_list = self.shelf_books + [current_book]
-            sorted_temp = sort_books_by_surname(temp_list)
+            sorted_temp = list(self.shelf_books)
+            sorted_temp.insert(correct_position, current_book)
             
             book_list = "\n".join([f"{t} by {a}" for t, a, _ in sorted_temp])
             # Show overlay on the game canvas
-            show_librarian_angry_overlay(self.main_canvas, self.root, book_list,
+            notifications.show_librarian_angry_overlay(self.main_canvas, self.root, book_list,
                                         on_close=lambda: self.continue_after_popup_wrong(correct_position, current_book))
     
     def continue_after_popup(self):
@@ -577,7 +691,7 @@ class LibraryGame:
     
     def continue_after_popup_wrong(self, correct_position, current_book):
         """Continue game after wrong answer popup closes."""
-        self.shelf_books.insert(correct_position, current_book)
+        self.shelf.insert(current_book)
         self.score_label.config(text=f"Score: {self.score}")
         self.current_book_index += 1
         
@@ -587,7 +701,12 @@ class LibraryGame:
             self.next_book()
     
     def next_book(self):
-        self.main_canvas.delete("all")
+        # Keep the shelf layer (so only the spans that change are re-rendered)
+        # and the hidden popups; everything else is redrawn
+        self.main_canvas.addtag_all("transient")
+        self.main_canvas.dtag(shelf_renderer.SHELF_LAYER_TAG, "transient")
+        self.main_canvas.dtag(notifications.POPUP_TAG, "transient")
+        self.main_canvas.delete("transient")
         self.book_images = []
         self.book_labels = []
         self.slot_areas = []
@@ -605,27 +724,43 @@ class LibraryGame:
         
         # Mark genre as complete and save progress
         max_score = self.total_books * 10
-        self.genre_progress = mark_genre_complete(
+        self.genre_progress = progress_tracker.mark_genre_complete(
             self.genre_progress, 
             self.selected_genre, 
             self.score
         )
         
         # Show enhanced end screen
-        show_enhanced_end_screen(
+        end_screen.show_enhanced_end_screen(
             self.root,
             self.score,
             max_score,
             self.selected_genre,
+            genre_progress=self.genre_progress,
             on_play_again=lambda: self.start_game_with_genre(self.selected_genre),
             on_home=self.show_title_screen,
             on_continue=self.show_story  # Continue goes to genre selection
         )
 
+def report_first_frame(root):
+    """
+    Wait until the title screen is on screen and print the time since startup.
+
+    Returns:
+        float: Time to first frame in milliseconds
+    """
+    root.wait_visibility()
+    root.update_idletasks()
+    elapsed_ms = (time.perf_counter() - STARTUP_T0) * 1000
+    print(f"[Startup] First frame after {elapsed_ms:.0f} ms")
+    return elapsed_ms
+
+
 def main():
     """Main function to run the game."""
     root = tk.Tk()
     game = LibraryGame(root)
+    report_first_frame(root)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -4,14 +4,43 @@ Improved book spine rendering with better dimensions and fonts
 Created from Hannah's bookspines.py
 """
 
-from PIL import Image, ImageDraw, ImageFont, ImageTk
+from functools import lru_cache
 
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw, ImageTk
 
+from src.fonts import get_font
+
+
+SPINE_CACHE_SIZE = 256
+
+
+MAX_FONT_SIZE = 24  # Hannah's improved: increased from 18
+MIN_FONT_SIZE = 16  # Hannah's improved: increased from 12
+MAX_BOOK_HEIGHT = 400  # Hannah's improved: decreased from 500
+VERTICAL_PADDING = 60
+HORIZONTAL_PADDING = 20
+SEPARATOR = "    "
+
+
+def measure_spine_text(title, author, font_size):
+    """Return the length in pixels of "TITLE    AUTHOR" on a spine at a font size."""
+    title_font = get_font('bold', font_size)
+    author_font = get_font('oblique', font_size)
+    return (title_font.getlength(title) + title_font.getlength(SEPARATOR)
+            + author_font.getlength(author.upper()))
+
+
+@lru_cache(maxsize=4096)
 def calculate_book_dimensions(title, author, width):
     """
     Calculate optimal book dimensions based on title, author, and width.
     Hannah's improved version with larger fonts and better fitting.
     
+    Text length grows with the font size, so the largest size that fits is
+    found with a binary search (at most 4 measurements instead of 9), and
+    results are memoized per (title, author, width).
+    
     Args:
         title (str): Book title
         author (str): Book author
@@ -20,39 +49,26 @@ def calculate_book_dimensions(title, author, width):
     Returns:
         tuple: (height, font_size)
     """
-    max_font_size = 24  # Hannah's improved: increased from 18
-    min_font_size = 16  # Hannah's improved: increased from 12
-    max_book_height = 400  # Hannah's improved: decreased from 500
-    min_book_height = 300  # Hannah's improved: increased from 200
-    
-    title_text = title
-    author_text = author.upper()
-    separator = "    "
-    
-    vertical_padding = 60
-    horizontal_padding = 20
-
-    for font_size in range(max_font_size, min_font_size - 1, -1):
-        try:
-            title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size, index=1)
-            author_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size, index=2)
-        except:
-            title_font = ImageFont.load_default()
-            author_font = ImageFont.load_default()
-        
-        title_length = title_font.getlength(title_text)
-        separator_length = title_font.getlength(separator)
-        author_length = author_font.getlength(author_text)
-        total_length = title_length + separator_length + author_length
-        
-        required_height = int(total_length) + vertical_padding
-        text_fits_width = total_length <= (width - horizontal_padding)
-        
+    def fits(total_length):
         # Hannah's improvement: check both height AND width constraints
-        if required_height <= max_book_height and text_fits_width:
-            return required_height, font_size
+        return (int(total_length) + VERTICAL_PADDING <= MAX_BOOK_HEIGHT
+                and total_length <= width - HORIZONTAL_PADDING)
 
-    return int(total_length) + vertical_padding, min_font_size
+    smallest = measure_spine_text(title, author, MIN_FONT_SIZE)
+    if not fits(smallest):
+        return int(smallest) + VERTICAL_PADDING, MIN_FONT_SIZE
+
+    best_size, best_length = MIN_FONT_SIZE, smallest
+    lo, hi = MIN_FONT_SIZE + 1, MAX_FONT_SIZE
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        total_length = measure_spine_text(title, author, mid)
+        if fits(total_length):
+            best_size, best_length = mid, total_length
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return int(best_length) + VERTICAL_PADDING, best_size
 
 
 def create_book_spine_image(width, height, color, title, author, font_size):
@@ -71,21 +87,94 @@ def create_book_spine_image(width, height, color, title, author, font_size):
     Returns:
         ImageTk.PhotoImage: The rendered book spine image
     """
-    img = Image.new('RGB', (width, height), color)
-    draw = ImageDraw.Draw(img)
+    return ImageTk.PhotoImage(render_book_spine(width, height, color, title, author, font_size))
+
+
+@lru_cache(maxsize=SPINE_CACHE_SIZE)
+def render_book_spine(width, height, color, title, author, font_size):
+    """
+    Render a book spine as a PIL image, memoized by all of its arguments.
+    The returned image is shared between callers and must not be modified.
     
-    # Create 3D effect with shading
-    dark = darken_color(color)
-    light = lighten_color(color)
+    Returns:
+        PIL.Image: The rendered book spine
+    """
+    img = Image.fromarray(spine_body_array(width, height, color), 'RGB')
+    text_layer, paste_x, paste_y = render_spine_text(width, height, color, title, author, font_size)
+    img.paste(text_layer, (paste_x, paste_y), text_layer)
+    return img
+
+
+def spine_body_array(width, height, color):
+    """
+    Build the shaded spine body (dark left edge, light right edge, light band
+    near the top, 3 px black outline) as one NumPy array.
+    Pixel-for-pixel the same as the original one-pixel rectangle loop.
     
-    # Draw shading
-    for i in range(10):
-        draw.rectangle([i, 0, i+1, height], fill=dark)
-    for i in range(10):
-        draw.rectangle([width-i-1, 0, width-i, height], fill=light)
-    draw.rectangle([8, 8, width-8, 22], fill=light)
-    draw.rectangle([0, 0, width-1, height-1], outline='black', width=3)
+    Returns:
+        np.ndarray: uint8 array of shape (height, width, 3)
+    """
+    body = np.empty((height, width, 3), dtype=np.uint8)
+    _paint_spine_body(body, color)
+    return body
+
+
+@lru_cache(maxsize=SPINE_CACHE_SIZE)
+def _spine_rows(width, color, channels):
+    """
+    Return the three distinct pixel rows of a spine body: plain, top band and outline.
+    Every row of a spine is one of these, so painting a body is three broadcasts.
+    """
+    base = parse_color(color)
+    dark = parse_color(darken_color(color))
+    light = parse_color(lighten_color(color))
+
+    plain = np.empty((width, channels), dtype=np.uint8)
+    if channels == 4:
+        plain[:, 3] = 255
+    plain[:, :3] = base
+    plain[:11, :3] = dark                       # for i in range(10): [i, 0, i+1, height]
+    plain[max(0, width - 10):, :3] = light      # for i in range(10): [width-i-1, 0, width-i, height]
+    band = plain.copy()
+    band[8:max(8, width - 7), :3] = light       # [8, 8, width-8, 22]
+    outline = np.zeros_like(plain)              # outline, width=3
+    if channels == 4:
+        outline[:, 3] = 255
+    for row in (plain, band):
+        row[:3, :3] = 0
+        row[max(0, width - 3):, :3] = 0
+    for row in (plain, band, outline):
+        row.setflags(write=False)
+    return plain, band, outline
+
+
+def _paint_spine_body(body, color, width=None, height=None, left=0, top=0):
+    """
+    Paint the spine body into a (rows, cols, 3 or 4) array view.
     
+    The view may be a clipped part of a width x height spine whose top-left
+    visible pixel is (left, top) in spine coordinates.
+    """
+    rows, cols, channels = body.shape
+    width = cols if width is None else width
+    height = rows if height is None else height
+    plain, band, outline = _spine_rows(width, color, channels)
+    columns = slice(left, left + cols)
+    body[:] = plain[columns]
+    for start, stop, row in ((8, 23, band), (0, 3, outline), (max(0, height - 3), height, outline)):
+        start, stop = max(start, top), min(stop, top + rows)
+        if start < stop:
+            body[start - top:stop - top] = row[columns]
+
+
+@lru_cache(maxsize=SPINE_CACHE_SIZE)
+def render_spine_text(width, height, color, title, author, font_size):
+    """
+    Render a spine's rotated "TITLE    AUTHOR" text on a transparent layer.
+    
+    Returns:
+        tuple: (RGBA image, paste_x, paste_y) relative to the spine
+    """
     title_text = title
     author_text = author.upper()
     separator = "    "
@@ -93,13 +182,9 @@ def create_book_spine_image(width, height, color, title, author, font_size):
     # Determine text color based on background
     text_fill_color = 'black' if color == "#ffb6c1" else ('#006400' if color == "#e8d5b7" else 'white')
 
-    try:
-        # Hannah's improvement: swapped font indices for better appearance
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size, index=2)
-        author_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size, index=1)
-    except IOError:
-        title_font = ImageFont.load_default()
-        author_font = ImageFont.load_default()
+    # Hannah's improvement: swapped font faces for better appearance
+    title_font = get_font('oblique', font_size)
+    author_font = get_font('bold', font_size)
 
     # Create rotated text image
     text_img_width = height - 60
@@ -124,34 +209,68 @@ def create_book_spine_image(width, height, color, title, author, font_size):
     start_x += title_length + separator_length
     text_draw.text((start_x, text_img_center_y), author_text, fill=text_fill_color, font=author_font, anchor='lm')
     
-    # Rotate and paste onto spine
     rotated = text_img.rotate(90, expand=True)
-    paste_x = (width - rotated.width) // 2
-    paste_y = (height - rotated.height) // 2
-    img.paste(rotated, (paste_x, paste_y), rotated)
+    return rotated, (width - rotated.width) // 2, (height - rotated.height) // 2
+
+
+def render_shelf_layer(spines, size, origin=(0, 0)):
+    """
+    Render every spine of a shelf into one RGBA buffer in a single pass.
     
-    return ImageTk.PhotoImage(img)
+    Args:
+        spines: Iterable of (x, y, width, height, color, title, author, font_size)
+        size (tuple): (width, height) of the layer; uncovered pixels stay transparent
+        origin (tuple): Position of the layer's top-left pixel in spine coordinates,
+            for rendering one region of a larger shelf; spines are clipped to the layer
+    
+    Returns:
+        PIL.Image: The RGBA shelf layer
+    """
+    layer_width, layer_height = size
+    origin_x, origin_y = origin
+    buffer = np.zeros((layer_height, layer_width, 4), dtype=np.uint8)
+    texts = []
+    for x, y, width, height, color, title, author, font_size in spines:
+        x, y = x - origin_x, y - origin_y
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, layer_width), min(y + height, layer_height)
+        if x0 >= x1 or y0 >= y1:
+            continue
+        _paint_spine_body(buffer[y0:y1, x0:x1], color, width, height, x0 - x, y0 - y)
+        texts.append((x, y, render_spine_text(width, height, color, title, author, font_size)))
 
+    layer = Image.fromarray(buffer, 'RGBA')
+    for x, y, (text_layer, paste_x, paste_y) in texts:
+        left, top = x + paste_x, y + paste_y
+        box = (max(0, -left), max(0, -top),
+               min(text_layer.width, layer_width - left), min(text_layer.height, layer_height - top))
+        if box[0] < box[2] and box[1] < box[3]:
+            layer.alpha_composite(text_layer, (left + box[0], top + box[1]), box)
+    return layer
+
+
+@lru_cache(maxsize=64)
+def parse_color(color):
+    """Parse a colour name, hex string or RGB tuple into an (r, g, b) tuple."""
+    if isinstance(color, tuple):
+        return color[:3]
+    return ImageColor.getrgb(color)[:3]
+
+
+@lru_cache(maxsize=64)
 def darken_color(color):
     """Darken a color for shading effect"""
-    if isinstance(color, str):
-        color = color.lstrip('#')
-        r, g, b = tuple(int(color[i:i+2], 16) for i in (0, 2, 4))
-    else:
-        r, g, b = color
+    r, g, b = parse_color(color)
     r, g, b = max(0, r - 50), max(0, g - 50), max(0, b - 50)
     if isinstance(color, str):
         return f'#{r:02x}{g:02x}{b:02x}'
     return (r, g, b)
 
 
+@lru_cache(maxsize=64)
 def lighten_color(color):
     """Lighten a color for highlight effect"""
-    if isinstance(color, str):
-        color = color.lstrip('#')
-        r, g, b = tuple(int(color[i:i+2], 16) for i in (0, 2, 4))
-    else:
-        r, g, b = color
+    r, g, b = parse_color(color)
     r, g, b = min(255, r + 50), min(255, g + 50), min(255, b + 50)
     if isinstance(color, str):
         return f'#{r:02x}{g:02x}{b:02x}'
@@ -0,0 +1,258 @@
+"""
+Book Catalog Module
+Loads and joins the book database once per process
+Provides indexed lookups by genre, title and integer book ID
+"""
+
+import json
+import os
+
+from src.names import AuthorName, compute_sort_keys
+
+
+GENRE_COLORS = {
+    'classic': "#e8d5b7",
+    'romance': "#ffb6c1",
+    'thriller': "#3d2817"
+}
+DEFAULT_COLOR = "#cccccc"
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+BOOK_COVERS_DIR = os.path.join(_script_dir, "..", "..", "artifacts", "book_covers")
+GAME_IMAGES_JSON = os.path.join(BOOK_COVERS_DIR, "game_images.json")
+LOCAL_IMAGES_JSON = os.path.join(BOOK_COVERS_DIR, "local_game_images.json")
+
+
+def record_author(book_data):
+    """Build the full author name from a game_images.json record."""
+    author_first = book_data.get("author first name", "")
+    author_surname = book_data.get("author surname", "")
+    return f"{author_first} {author_surname}".strip()
+
+
+def record_name(book_data):
+    """
+    Return the record's own given name/surname split, or None if it has no surname.
+    The database's split wins over parsing ("Simone St." + "James" sorts under James).
+    """
+    surname = " ".join((book_data.get("author surname") or "").split())
+    if not surname:
+        return None
+    return AuthorName(" ".join((book_data.get("author first name") or "").split()), surname, "")
+
+
+class BookCatalog:
+    """
+    In-memory book catalog with integer book IDs.
+
+    Books are stored column-wise and numbered in (genre, rank) order, so the
+    books of one genre always occupy a contiguous run of IDs.
+
+    Code outside this module uses only the catalog interface, which
+    MappedCatalog (src/catalog_binary.py) implements too: len(), book,
+    book_id, author, genre, rank, name_keys, cover_path, ids_by_genre,
+    books_by_genre, key_column and derived. The column lists (titles,
+    authors, ...) only exist on in-memory catalogs.
+    """
+
+    def __init__(self, records, cover_paths=None):
+        """
+        Build the catalog from raw book records.
+
+        Args:
+            records: Iterable of dicts in the game_images.json schema
+            cover_paths (dict): Title -> cover path relative to book_covers/
+        """
+        rows = []
+        for book_data in records:
+            genre = (book_data.get("Genre") or "").lower()
+            rank = book_data.get("rank") or 0
+            rows.append((genre, rank, book_data.get("title"), record_author(book_data), record_name(book_data)))
+        rows.sort(key=lambda row: (row[0], row[1]))
+
+        self.titles = []
+        self.authors = []
+        self.colors = []
+        self.genres = []
+        self.ranks = []
+        self.surname_keys = []
+        self.first_name_keys = []
+        self._id_by_title = {}
+        self._genre_ranges = {}
+
+        # Name keys are built once per distinct author, at load time
+        keys_by_author = {}
+        for book_id, (genre, rank, title, author, name) in enumerate(rows):
+            keys = keys_by_author.get((author, name))
+            if keys is None:
+                keys = keys_by_author[(author, name)] = compute_sort_keys(author, name)
+            self.surname_keys.append(keys[0])
+            self.first_name_keys.append(keys[1])
+
+            self.titles.append(title)
+            self.authors.append(author)
+            self.colors.append(GENRE_COLORS.get(genre, DEFAULT_COLOR))
+            self.genres.append(genre)
+            self.ranks.append(rank)
+            self._id_by_title.setdefault(title, book_id)
+
+            start, _ = self._genre_ranges.get(genre, (book_id, book_id))
+            self._genre_ranges[genre] = (start, book_id + 1)
+
+        self.cover_paths = dict(cover_paths or {})
+        self._books_by_genre = {}
+        self._key_columns = {}
+        self._derived = {}
+
+    @classmethod
+    def from_json(cls, game_images_path=GAME_IMAGES_JSON, local_images_path=LOCAL_IMAGES_JSON):
+        """
+        Load the catalog from game_images.json and local_game_images.json.
+
+        Args:
+            game_images_path (str): Path to the list-based book database
+            local_images_path (str): Path to the title -> local cover mapping
+
+        Returns:
+            BookCatalog: The joined catalog (empty if the database is missing)
+        """
+        records = []
+        try:
+            with open(game_images_path, "r") as f:
+                records = json.load(f)
+        except FileNotFoundError:
+            print(f"Error: game_images.json not found at {game_images_path}")
+
+        cover_paths = {}
+        try:
+            with open(local_images_path, "r") as f:
+                full_book_data = json.load(f)
+            cover_paths = {title: details["Local_Path"] for title, details in full_book_data.items()}
+        except FileNotFoundError:
+            print(f"Error: local_game_images.json not found at {local_images_path}")
+
+        return cls(records, cover_paths)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def book(self, book_id):
+        """Return the (title, author, color) tuple for a book ID."""
+        return (self.titles[book_id], self.authors[book_id], self.colors[book_id])
+
+    def book_id(self, title):
+        """Return the book ID for a title, or None if it is not in the catalog."""
+        return self._id_by_title.get(title)
+
+    def author(self, book_id):
+        """Return the full author name of a book ID."""
+        return self.authors[book_id]
+
+    def genre(self, book_id):
+        """Return the (lower-case) genre of a book ID."""
+        return self.genres[book_id]
+
+    def rank(self, book_id):
+        """Return the database rank of a book ID."""
+        return self.ranks[book_id]
+
+    def name_keys(self, book_id):
+        """Return the cached (surname_key, first_name_key) of a book ID."""
+        return self.surname_keys[book_id], self.first_name_keys[book_id]
+
+    def key_column(self, name, build):
+        """
+        Return a cached per-book column (e.g. a sort rule's keys), building it once.
+
+        Args:
+            name (str): Column name
+            build (function): Called with the catalog, returns one value per book ID
+
+        Returns:
+            list: Column values indexed by book ID
+        """
+        column = self._key_columns.get(name)
+        if column is None:
+            column = self._key_columns[name] = build(self)
+        return column
+
+    def derived(self, name, build):
+        """
+        Return a cached structure derived from the catalog (an index, a lookup
+        table, ...), building it once. Per-book columns belong in key_column.
+
+        Args:
+            name (str): Structure name
+            build (function): Called with the catalog, returns the structure
+
+        Returns:
+            The cached structure
+        """
+        value = self._derived.get(name)
+        if value is None:
+            value = self._derived[name] = build(self)
+        return value
+
+    def cover_path(self, title):
+        """Return the cover path (relative to book_covers/) for a title, or None."""
+        return self.cover_paths.get(title)
+
+    def ids_by_genre(self, genre):
+        """
+        Return the IDs of every book in a genre.
+
+        Returns:
+            range: Contiguous ID range (empty for unknown genres)
+        """
+        start, stop = self._genre_ranges.get(genre.lower(), (0, 0))
+        return range(start, stop)
+
+    def books_by_genre(self, genre):
+        """
+        Return the (title, author, color) tuples of a genre, built once and cached.
+
+        Returns:
+            list: Books of the genre in rank order (callers must not mutate it)
+        """
+        genre = genre.lower()
+        books = self._books_by_genre.get(genre)
+        if books is None:
+            books = [self.book(book_id) for book_id in self.ids_by_genre(genre)]
+            self._books_by_genre[genre] = books
+        return books
+
+
+_catalog = None
+
+
+def get_catalog():
+    """
+    Return the process-wide catalog, loading it on first use.
+    Uses the memory-mapped binary catalog if it has been compiled.
+
+    Returns:
+        BookCatalog: The shared catalog
+    """
+    global _catalog
+    if _catalog is None:
+        # Prefer the compiled binary catalog when it is newer than the JSON files
+        from src.catalog_binary import CATALOG_BIN, MappedCatalog, is_up_to_date
+        if is_up_to_date(CATALOG_BIN):
+            try:
+                _catalog = MappedCatalog(CATALOG_BIN)
+            except (OSError, ValueError) as e:
+                print(f"[Catalog] Could not map {CATALOG_BIN}: {e}")
+        if _catalog is None:
+            _catalog = BookCatalog.from_json()
+    return _catalog
+
+
+def set_catalog(catalog):
+    """
+    Replace the process-wide catalog (e.g. with a larger deployment catalog).
+
+    Args:
+        catalog (BookCatalog): Catalog to use, or None to reload lazily
+    """
+    global _catalog
+    _catalog = catalog
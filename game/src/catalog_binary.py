@@ -0,0 +1,257 @@
+"""
+Binary Catalog Module
+Compiles game_images.json + local_game_images.json into a compact binary file
+and memory-maps it, so loading does not depend on the catalog size
+
+File layout (little-endian):
+    header        magic, version, book/genre counts and section offsets
+    genre table   one entry per genre: name string, first book ID, book count
+    records       one fixed-width record per book, in (genre, rank) order
+    title index   book IDs sorted by UTF-8 title, for binary-search lookups
+    string table  deduplicated UTF-8 strings referenced by (offset, length)
+
+Run `python -m src.catalog_binary` from game/ to rebuild the file.
+"""
+
+import mmap
+import os
+import struct
+import sys
+
+from src.catalog import (
+    BookCatalog, GENRE_COLORS, DEFAULT_COLOR, BOOK_COVERS_DIR,
+    GAME_IMAGES_JSON, LOCAL_IMAGES_JSON
+)
+
+
+CATALOG_BIN = os.path.join(BOOK_COVERS_DIR, "catalog.bin")
+
+MAGIC = b"DWYC"
+VERSION = 2  # 2: name keys follow the database's surname field
+NO_STRING = 0xFFFFFFFF
+
+# magic, version, reserved, n_books, n_genres, genres, records, title index, strings
+HEADER = struct.Struct("<4sHHIIIIII")
+# name offset, name length, first book ID, book count
+GENRE_ENTRY = struct.Struct("<IIII")
+# genre code, rank, then (offset, length) for title, author, cover path,
+# folded surname and folded given name
+RECORD = struct.Struct("<IIIIIIIIIIII")
+BOOK_ID = struct.Struct("<I")
+
+
+class _StringTable:
+    """Deduplicating UTF-8 string table builder."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = {}
+
+    def add(self, text):
+        """Return (offset, length) for a string, storing it only once."""
+        if text is None:
+            return NO_STRING, 0
+        ref = self.offsets.get(text)
+        if ref is None:
+            encoded = text.encode("utf-8")
+            ref = self.offsets[text] = (len(self.data), len(encoded))
+            self.data += encoded
+        return ref
+
+
+def compile_catalog(out_path=CATALOG_BIN, game_images_path=GAME_IMAGES_JSON,
+                    local_images_path=LOCAL_IMAGES_JSON):
+    """
+    Compile the JSON book database into the binary catalog format.
+
+    Args:
+        out_path (str): Where to write the binary catalog
+        game_images_path (str): Path to game_images.json
+        local_images_path (str): Path to local_game_images.json
+
+    Returns:
+        int: Number of books written
+    """
+    catalog = BookCatalog.from_json(game_images_path, local_images_path)
+    strings = _StringTable()
+
+    genres = []
+    genre_codes = {}
+    for book_id in range(len(catalog)):
+        genre = catalog.genre(book_id)
+        if genre not in genre_codes:
+            genre_codes[genre] = len(genres)
+            genres.append(genre)
+
+    genre_table = bytearray()
+    for genre in genres:
+        ids = catalog.ids_by_genre(genre)
+        name_offset, name_length = strings.add(genre)
+        genre_table += GENRE_ENTRY.pack(name_offset, name_length, ids.start, len(ids))
+
+    records = bytearray()
+    for book_id in range(len(catalog)):
+        title, author, _ = catalog.book(book_id)
+        surname, given = catalog.name_keys(book_id)[0]
+        records += RECORD.pack(
+            genre_codes[catalog.genre(book_id)], catalog.rank(book_id),
+            *strings.add(title),
+            *strings.add(author),
+            *strings.add(catalog.cover_path(title)),
+            *strings.add(surname),
+            *strings.add(given),
+        )
+
+    title_order = sorted(range(len(catalog)), key=lambda book_id: catalog.book(book_id)[0].encode("utf-8"))
+    title_index = b"".join(BOOK_ID.pack(book_id) for book_id in title_order)
+
+    genres_offset = HEADER.size
+    records_offset = genres_offset + len(genre_table)
+    title_index_offset = records_offset + len(records)
+    strings_offset = title_index_offset + len(title_index)
+    header = HEADER.pack(MAGIC, VERSION, 0, len(catalog), len(genres),
+                         genres_offset, records_offset, title_index_offset, strings_offset)
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(genre_table)
+        f.write(records)
+        f.write(title_index)
+        f.write(strings.data)
+    os.replace(tmp_path, out_path)
+    return len(catalog)
+
+
+class MappedCatalog(BookCatalog):
+    """
+    Read-only catalog backed by a memory-mapped binary file.
+
+    Nothing is decoded up front: records and strings are read from the map
+    on demand, so opening costs the same for 200 or 2 million books.
+    Implements the catalog interface described on BookCatalog; it has no
+    column lists.
+    """
+
+    def __init__(self, path=CATALOG_BIN):
+        """
+        Open and map a compiled catalog.
+
+        Args:
+            path (str): Path to a file written by compile_catalog
+
+        Raises:
+            ValueError: If the file is not a compatible binary catalog
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, _, self._count, n_genres, genres_offset, self._records_offset,
+         self._title_index_offset, self._strings_offset) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} Dewey catalog")
+
+        self._genre_names = []
+        self._genre_ranges = {}
+        for code in range(n_genres):
+            name_offset, name_length, first_id, count = GENRE_ENTRY.unpack_from(
+                self._map, genres_offset + code * GENRE_ENTRY.size)
+            genre = self._string(name_offset, name_length)
+            self._genre_names.append(genre)
+            self._genre_ranges[genre] = (first_id, first_id + count)
+
+        self._books_by_genre = {}
+        self._key_columns = {}
+        self._derived = {}
+
+    def close(self):
+        """Release the memory map and file handle."""
+        self._map.close()
+        self._file.close()
+
+    def _string(self, offset, length):
+        if offset == NO_STRING:
+            return None
+        start = self._strings_offset + offset
+        return self._map[start:start + length].decode("utf-8")
+
+    def _record(self, book_id):
+        if not 0 <= book_id < self._count:
+            raise IndexError(f"book ID {book_id} out of range")
+        return RECORD.unpack_from(self._map, self._records_offset + book_id * RECORD.size)
+
+    def __len__(self):
+        return self._count
+
+    def book(self, book_id):
+        record = self._record(book_id)
+        genre = self._genre_names[record[0]]
+        return (self._string(record[2], record[3]), self._string(record[4], record[5]),
+                GENRE_COLORS.get(genre, DEFAULT_COLOR))
+
+    def author(self, book_id):
+        record = self._record(book_id)
+        return self._string(record[4], record[5])
+
+    def genre(self, book_id):
+        """Return the (lower-case) genre of a book ID."""
+        return self._genre_names[self._record(book_id)[0]]
+
+    def rank(self, book_id):
+        """Return the database rank of a book ID."""
+        return self._record(book_id)[1]
+
+    def name_keys(self, book_id):
+        record = self._record(book_id)
+        surname = self._string(record[8], record[9])
+        given = self._string(record[10], record[11])
+        return (surname, given), (given or surname, surname)
+
+    def book_id(self, title):
+        """Binary-search the title index for a title."""
+        target = title.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            book_id = BOOK_ID.unpack_from(self._map, self._title_index_offset + mid * BOOK_ID.size)[0]
+            record = self._record(book_id)
+            start = self._strings_offset + record[2]
+            candidate = self._map[start:start + record[3]]
+            if candidate < target:
+                lo = mid + 1
+            elif candidate > target:
+                hi = mid
+            else:
+                return book_id
+        return None
+
+    def cover_path(self, title):
+        book_id = self.book_id(title)
+        if book_id is None:
+            return None
+        record = self._record(book_id)
+        return self._string(record[6], record[7])
+
+
+def is_up_to_date(path=CATALOG_BIN, sources=(GAME_IMAGES_JSON, LOCAL_IMAGES_JSON)):
+    """Return True if the binary catalog exists and is newer than its JSON sources."""
+    try:
+        built = os.path.getmtime(path)
+        return all(os.path.getmtime(source) <= built for source in sources)
+    except OSError:
+        return False
+
+
+def main(argv=None):
+    """Compile the shipped JSON database into artifacts/book_covers/catalog.bin."""
+    argv = sys.argv[1:] if argv is None else argv
+    out_path = argv[0] if argv else CATALOG_BIN
+    count = compile_catalog(out_path)
+    print(f"[Catalog] Compiled {count} books into {os.path.abspath(out_path)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
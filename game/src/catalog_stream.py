@@ -0,0 +1,146 @@
+"""
+Streaming Catalog Module
+Reads the game_images.json book list incrementally as a generator pipeline,
+so filtering one genre never materializes the whole file in memory
+Can also write per-genre pre-filtered files for later loads
+"""
+
+import json
+import os
+
+from src.catalog import GAME_IMAGES_JSON, GENRE_COLORS, DEFAULT_COLOR, record_author
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_json_array(fp, chunk_size=CHUNK_SIZE):
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    Only the current element plus one read chunk is held in memory.
+
+    Args:
+        fp: Text file object positioned at the start of a JSON array
+        chunk_size (int): Characters read per refill
+
+    Raises:
+        ValueError: If the input is not a JSON array
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    started = False
+
+    while True:
+        # Skip whitespace and separators
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+
+        if pos >= len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            chunk = fp.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+
+        if not started:
+            if buffer[pos] != "[":
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+            continue
+
+        if buffer[pos] == "]":
+            return
+
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            end = None
+        # An element touching the end of the buffer may be incomplete: refill first
+        if end is None or (end == len(buffer) and not eof):
+            if eof:
+                raise ValueError(f"Malformed JSON array element at offset {pos}")
+            chunk = fp.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+
+        yield value
+        pos = end
+        if pos > chunk_size:
+            buffer, pos = buffer[pos:], 0
+
+
+def iter_records(path=GAME_IMAGES_JSON, chunk_size=CHUNK_SIZE):
+    """Yield the raw book dicts of a game_images.json-style file."""
+    with open(path, "r", encoding="utf-8") as f:
+        yield from iter_json_array(f, chunk_size)
+
+
+def filter_genre(records, genre):
+    """Keep only the raw records of one genre."""
+    genre = genre.lower()
+    for book_data in records:
+        if (book_data.get("Genre") or "").lower() == genre:
+            yield book_data
+
+
+def to_books(records):
+    """Turn raw records into (title, author, color) tuples."""
+    for book_data in records:
+        color = GENRE_COLORS.get((book_data.get("Genre") or "").lower(), DEFAULT_COLOR)
+        yield (book_data.get("title"), record_author(book_data), color)
+
+
+def genre_file_path(genre, path=GAME_IMAGES_JSON):
+    """Return the pre-filtered file path for a genre, e.g. game_images.thriller.json."""
+    base, ext = os.path.splitext(path)
+    return f"{base}.{genre.lower()}{ext}"
+
+
+def write_genre_file(genre, out_path=None, path=GAME_IMAGES_JSON):
+    """
+    Stream one genre's raw records into its own JSON array file.
+
+    Args:
+        genre (str): Genre to keep
+        out_path (str): Destination (defaults to genre_file_path(genre, path))
+        path (str): Source game_images.json-style file
+
+    Returns:
+        int: Number of records written
+    """
+    out_path = out_path or genre_file_path(genre, path)
+    tmp_path = out_path + ".tmp"
+    count = 0
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        out.write("[")
+        for book_data in filter_genre(iter_records(path), genre):
+            out.write(",\n" if count else "\n")
+            json.dump(book_data, out, ensure_ascii=False)
+            count += 1
+        out.write("\n]\n")
+    os.replace(tmp_path, out_path)
+    return count
+
+
+def iter_books_by_genre(genre, path=GAME_IMAGES_JSON):
+    """
+    Stream the (title, author, color) books of one genre.
+    Reads the pre-filtered genre file when it is newer than the source.
+
+    Args:
+        genre (str): Genre to load
+        path (str): Source game_images.json-style file
+    """
+    genre_path = genre_file_path(genre, path)
+    try:
+        if os.path.getmtime(genre_path) >= os.path.getmtime(path):
+            path = genre_path
+    except OSError:
+        pass
+    yield from to_books(filter_genre(iter_records(path), genre))
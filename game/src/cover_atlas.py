@@ -0,0 +1,187 @@
+"""
+Cover Atlas Module
+Bakes every book cover at gameplay size into a few JPEG atlas pages plus a
+JSON index of tile rectangles, and crops covers back out of the decoded pages
+
+Covers are baked in book ID order, so the books of one genre share a handful
+of pages and a round only decodes those.
+
+Run `python -m src.cover_atlas` from game/ to rebuild the atlas.
+"""
+
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+from src.catalog import BOOK_COVERS_DIR, GAME_IMAGES_JSON, LOCAL_IMAGES_JSON, BookCatalog
+from src.cover_cache import load_cover
+
+
+ATLAS_DIR = os.path.join(BOOK_COVERS_DIR, "atlas")
+ATLAS_INDEX = os.path.join(ATLAS_DIR, "atlas_index.json")
+ATLAS_VERSION = 1
+
+COVER_SIZE = (268, 402)  # size draw_book_to_place shows covers at
+TILES_PER_ROW = 8
+ROWS_PER_PAGE = 4
+JPEG_QUALITY = 90
+MAX_OPEN_PAGES = 3
+
+
+def bake_atlas(out_dir=ATLAS_DIR, size=COVER_SIZE, game_images_path=GAME_IMAGES_JSON,
+               local_images_path=LOCAL_IMAGES_JSON):
+    """
+    Resize every local cover to `size` and pack them into atlas pages.
+
+    Args:
+        out_dir (str): Directory for the pages and atlas_index.json
+        size (tuple): (width, height) of each tile
+        game_images_path (str): Path to game_images.json
+        local_images_path (str): Path to local_game_images.json
+
+    Returns:
+        int: Number of covers baked
+    """
+    catalog = BookCatalog.from_json(game_images_path, local_images_path)
+    covers_dir = os.path.dirname(os.path.abspath(local_images_path))
+    os.makedirs(out_dir, exist_ok=True)
+
+    width, height = size
+    per_page = TILES_PER_ROW * ROWS_PER_PAGE
+    pages = []
+    tiles = {}
+    page = None
+
+    for book_id in range(len(catalog)):
+        title = catalog.book(book_id)[0]
+        cover_path = catalog.cover_path(title)
+        if not cover_path or title in tiles:
+            continue
+        try:
+            cover = load_cover(os.path.join(covers_dir, cover_path), size)
+        except (FileNotFoundError, OSError) as e:
+            print(f"[CoverAtlas] Skipping {title!r}: {e}")
+            continue
+
+        slot = len(tiles) % per_page
+        if slot == 0:
+            if page is not None:
+                _save_page(page, out_dir, pages)
+            page = Image.new("RGB", (width * TILES_PER_ROW, height * ROWS_PER_PAGE))
+        x = (slot % TILES_PER_ROW) * width
+        y = (slot // TILES_PER_ROW) * height
+        page.paste(cover, (x, y))
+        tiles[title] = [len(pages), x, y, width, height]
+
+    if page is not None:
+        _save_page(page, out_dir, pages)
+
+    index = {'version': ATLAS_VERSION, 'tile_size': list(size), 'pages': pages, 'tiles': tiles}
+    tmp_path = os.path.join(out_dir, "atlas_index.json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(out_dir, "atlas_index.json"))
+    return len(tiles)
+
+
+def _save_page(page, out_dir, pages):
+    name = f"atlas_{len(pages):03d}.jpg"
+    page.save(os.path.join(out_dir, name), "JPEG", quality=JPEG_QUALITY)
+    pages.append(name)
+
+
+class CoverAtlas:
+    """
+    Baked cover atlas.
+
+    Pages are decoded on first use and the most recently used MAX_OPEN_PAGES
+    stay in memory; `cover` crops a tile out of its decoded page.
+    """
+
+    def __init__(self, index_path=ATLAS_INDEX):
+        """
+        Args:
+            index_path (str): Path to an atlas_index.json written by bake_atlas
+
+        Raises:
+            ValueError: If the index is not a compatible atlas index
+        """
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get('version') != ATLAS_VERSION:
+            raise ValueError(f"{index_path} is not a version {ATLAS_VERSION} cover atlas")
+        self.directory = os.path.dirname(os.path.abspath(index_path))
+        self.tile_size = tuple(index['tile_size'])
+        self.pages = index['pages']
+        self.tiles = index['tiles']
+        self._open_pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, index_path=ATLAS_INDEX):
+        """Return the atlas if it exists and is newer than the cover list, else None."""
+        if not is_up_to_date(index_path):
+            return None
+        try:
+            return cls(index_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[CoverAtlas] Could not open {index_path}: {e}")
+            return None
+
+    def __contains__(self, title):
+        return title in self.tiles
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def _page(self, number):
+        with self._lock:
+            page = self._open_pages.get(number)
+            if page is not None:
+                self._open_pages.move_to_end(number)
+                return page
+            page = Image.open(os.path.join(self.directory, self.pages[number]))
+            page.load()
+            self._open_pages[number] = page
+            while len(self._open_pages) > MAX_OPEN_PAGES:
+                self._open_pages.popitem(last=False)
+            return page
+
+    def cover(self, title):
+        """
+        Crop a cover out of the atlas.
+
+        Returns:
+            PIL.Image: The cover at tile_size, or None if it was not baked
+        """
+        tile = self.tiles.get(title)
+        if tile is None:
+            return None
+        number, x, y, width, height = tile
+        return self._page(number).crop((x, y, x + width, y + height))
+
+
+def is_up_to_date(index_path=ATLAS_INDEX, sources=(LOCAL_IMAGES_JSON,)):
+    """Return True if the atlas index exists and is newer than its sources."""
+    try:
+        built = os.path.getmtime(index_path)
+        return all(os.path.getmtime(source) <= built for source in sources)
+    except OSError:
+        return False
+
+
+def main(argv=None):
+    """Bake the shipped covers into artifacts/book_covers/atlas/."""
+    argv = sys.argv[1:] if argv is None else argv
+    out_dir = argv[0] if argv else ATLAS_DIR
+    count = bake_atlas(out_dir)
+    print(f"[CoverAtlas] Baked {count} covers into {os.path.abspath(out_dir)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Cover Cache Module
+Bounded LRU cache of decoded, resized book covers keyed by (title, size)
+Keeps the covers within a memory budget and counts hits and misses
+"""
+
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+
+COVER_CACHE_BUDGET = 64 * 1024 * 1024  # bytes of decoded pixels
+
+
+def image_nbytes(img, size):
+    """Return the decoded size in bytes of a PIL image of the given (width, height)."""
+    return size[0] * size[1] * len(img.getbands())
+
+
+def load_cover(path, size):
+    """
+    Decode a cover file and resize it for display.
+
+    Args:
+        path (str): Cover image path
+        size (tuple): (width, height) in pixels
+
+    Returns:
+        PIL.Image: The resized RGB cover
+
+    Raises:
+        FileNotFoundError: If the cover file is missing
+    """
+    with Image.open(path) as img:
+        img.draft("RGB", size)  # let JPEG decode at a reduced scale when it can
+        return img.convert("RGB").resize(size, Image.Resampling.LANCZOS)
+
+
+class CoverCache:
+    """
+    LRU cache of PIL cover images.
+
+    Entries are keyed by (title, (width, height)). When the decoded pixels of
+    all entries exceed `budget_bytes`, the least recently used are dropped.
+    The cache is thread-safe so covers can be filled off the main thread.
+    """
+
+    def __init__(self, budget_bytes=COVER_CACHE_BUDGET):
+        """
+        Args:
+            budget_bytes (int): Maximum decoded bytes kept in memory
+        """
+        self.budget_bytes = budget_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, title, size):
+        """Return the cached cover for (title, size) or None, counting the hit or miss."""
+        key = (title, tuple(size))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, title, size, img):
+        """Store a cover, evicting least recently used covers past the budget."""
+        key = (title, tuple(size))
+        nbytes = image_nbytes(img, key[1])
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            if nbytes > self.budget_bytes:
+                return img
+            self._entries[key] = (img, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.budget_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_bytes
+                self.evictions += 1
+        return img
+
+    def get_or_load(self, title, size, loader):
+        """
+        Return the cached cover, or build it with `loader()` and cache it.
+
+        Args:
+            title (str): Book title
+            size (tuple): (width, height) in pixels
+            loader (function): Called with no arguments on a miss; returns a PIL image
+
+        Returns:
+            PIL.Image: The cover
+        """
+        img = self.get(title, size)
+        if img is None:
+            img = self.put(title, size, loader())
+        return img
+
+    def clear(self):
+        """Drop every cached cover (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: entries, bytes, budget, hits, misses, evictions and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.nbytes,
+            'budget': self.budget_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,103 @@
+"""
+Cover Prefetch Module
+Decodes and resizes upcoming book covers on a thread pool while the player
+is busy with the current book; finished covers are handed back to the Tk
+main thread through a queue polled with root.after
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+PREFETCH_AHEAD = 2
+POLL_MS = 30
+
+
+class CoverPrefetcher:
+    """
+    Fills a CoverCache ahead of time.
+
+    `prefetch` submits covers that are neither cached nor already pending.
+    Worker threads only run `loader`; the main thread moves their results
+    into the cache from `poll`, so the only cover work left for
+    draw_book_to_place is creating the PhotoImage.
+    """
+
+    def __init__(self, root, cache, loader, workers=2, poll_ms=POLL_MS):
+        """
+        Args:
+            root: Tk root used to schedule polling
+            cache: CoverCache to fill
+            loader (function): (title, author, color, size) -> PIL image, run on a worker
+            workers (int): Size of the thread pool
+            poll_ms (int): Milliseconds between queue polls while work is pending
+        """
+        self.root = root
+        self.cache = cache
+        self.loader = loader
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="CoverPrefetch")
+        self._done = queue.Queue()
+        self._pending = {}
+        self._polling = False
+
+    def prefetch(self, books, size):
+        """
+        Start decoding covers for books that are not cached yet.
+
+        Args:
+            books: Iterable of (title, author, color) books
+            size (tuple): (width, height) the covers will be drawn at
+
+        Returns:
+            int: Number of covers submitted
+        """
+        size = tuple(size)
+        submitted = 0
+        for title, author, color in books:
+            key = (title, size)
+            if key in self._pending or key in self.cache:
+                continue
+            self._pending[key] = self._executor.submit(self._load, key, title, author, color)
+            submitted += 1
+        if submitted and not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self.poll)
+        return submitted
+
+    def _load(self, key, title, author, color):
+        try:
+            img = self.loader(title, author, color, key[1])
+        except Exception as e:
+            print(f"[CoverPrefetch] Could not prefetch {title!r}: {e}")
+            img = None
+        self._done.put((key, img))
+        return img
+
+    def poll(self):
+        """Move finished covers into the cache; keep polling while any are pending."""
+        while True:
+            try:
+                key, img = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.pop(key, None)
+            if img is not None:
+                self.cache.put(key[0], key[1], img)
+        if self._pending:
+            self.root.after(self.poll_ms, self.poll)
+        else:
+            self._polling = False
+
+    def wait(self, title, size):
+        """
+        Return the cover for a pending prefetch, blocking until its worker
+        finishes, or None if it was never submitted.
+        """
+        future = self._pending.get((title, tuple(size)))
+        return future.result() if future is not None else None
+
+    def shutdown(self):
+        """Stop accepting work and drop queued prefetches."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
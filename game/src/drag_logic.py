@@ -78,23 +78,27 @@ class DragManager:
 
         for book in self.game.book_labels:
             if book['index'] >= slot_idx:
-                book['current_x'] = book['original_x'] + gap_size
+                self.shift_book(book, book['original_x'] + gap_size)
             else:
-                book['current_x'] = book['original_x']
-            self.redraw_book(book)
+                self.shift_book(book, book['original_x'])
+        if self.game.shelf_renderer is not None:
+            self.game.shelf_renderer.flush()
     
     def on_slot_leave(self):
         if self.game.selected_slot is not None:
             return
         self.game.hovered_slot = None
         for book in self.game.book_labels:
-            book['current_x'] = book['original_x']
-            self.redraw_book(book)
+            self.shift_book(book, book['original_x'])
+        if self.game.shelf_renderer is not None:
+            self.game.shelf_renderer.flush()
     
-    def redraw_book(self, book):
-        self.game.main_canvas.delete(f"book_{book['index']}")
-        self.game.draw_book_spine(
-            book['index'], book['current_x'], book['y'],
-            book['width'], book['height'], book['color'],
-            book['title'], book['author'], book['font_size']
-        )
\ No newline at end of file
+    def shift_book(self, book, x):
+        """Slide a drawn spine to x: move its canvas item, or mark its span dirty on the shelf layer."""
+        if self.game.shelf_renderer is not None:
+            self.game.shelf_renderer.move(book, x)
+            return
+        dx = x - book['current_x']
+        if dx:
+            self.game.main_canvas.move(f"book_{book['index']}", dx, 0)
+            book['current_x'] = x
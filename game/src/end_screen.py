@@ -1,6 +1,137 @@
+"""
+End Screen Module
+Shows the session summary over a background that reflects which genres are complete
+
+Backgrounds are layered when artifacts/finalscores/layers/ provides them:
+    base.png                the library before any genre is sorted
+    overlay_<genre>.png     one per genre ('classic', 'romance', 'thriller'),
+                            RGBA, transparent except where that genre's
+                            shelves change once it is completed
+All layers must have the same size. Completed genres' overlays are
+alpha-composited over the base in genre order. If the base or any needed
+overlay is missing, the matching pre-rendered artifacts/finalscores/library_*.png
+is used instead (the only art shipped today).
+"""
+
 import tkinter as tk
-from PIL import Image, ImageTk
+from PIL import ImageTk
 import os
+import threading
+from collections import OrderedDict
+
+from src.gamebackground import get_pyramid
+
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+FINALSCORES_DIR = os.path.join(_script_dir, "..", "..", "artifacts", "finalscores")
+# Layered assets: base.png plus overlay_<genre>.png (RGBA) for each genre
+LAYERS_DIR = os.path.join(FINALSCORES_DIR, "layers")
+COMPOSITE_CACHE_SIZE = 4
+
+_composites = OrderedDict()
+_composites_lock = threading.Lock()
+
+
+def completed_genres(genre_progress):
+    """Return the sorted tuple of completed genres."""
+    return tuple(sorted(genre for genre, progress in genre_progress.items() if progress.get('completed', False)))
+
+
+def legacy_background_name(completed):
+    """Pick the pre-rendered background for a set of completed genres."""
+    completed = set(completed)
+    if completed >= {'classic', 'romance', 'thriller'}: 
+        return "library_all_clean"
+    elif completed >= {'classic', 'romance'}: 
+        return "library_classic_romance"
+    elif completed >= {'classic', 'thriller'}: 
+        return "library_classic_thriller"
+    elif completed >= {'romance', 'thriller'}: 
+        return "library_romance_thriller"
+    elif 'classic' in completed: 
+        return "library_classic_only"
+    elif 'romance' in completed: 
+        return "library_romance_only"
+    elif 'thriller' in completed: 
+        return "library_thriller_only"
+    return "library_all_messy"
+
+
+def find_legacy_background(bg_file):
+    """Return the path of a pre-rendered background, or None."""
+    # Path 1: src/ -> game/ -> GithubVersion/ -> artifacts/finalscores/
+    # Path 2: Just in case structure is different
+    for base in (FINALSCORES_DIR, os.path.join(_script_dir, "..", "artifacts", "finalscores")):
+        for path in (os.path.join(base, bg_file + ".png"), os.path.join(base, bg_file)):
+            abs_path = os.path.abspath(path)
+            if os.path.exists(abs_path):
+                return abs_path
+    return None
+
+
+def layer_paths(completed, layers_dir=LAYERS_DIR):
+    """
+    Return [base, overlay...] for the completed genres, or None if any layer is missing.
+    """
+    paths = [os.path.join(layers_dir, "base.png")]
+    paths += [os.path.join(layers_dir, f"overlay_{genre}.png") for genre in completed]
+    return paths if all(os.path.exists(path) for path in paths) else None
+
+
+def compose_end_background(genre_progress, size, layers_dir=LAYERS_DIR):
+    """
+    Build the end-screen background for a progress state at a window size.
+    Results are cached per (completed genres, size).
+
+    Returns:
+        PIL.Image: The background, or None if no asset was found
+    """
+    completed = completed_genres(genre_progress)
+    key = (completed, tuple(size), layers_dir)
+    with _composites_lock:
+        if key in _composites:
+            _composites.move_to_end(key)
+            return _composites[key]
+
+    paths = layer_paths(completed, layers_dir)
+    if paths is not None:
+        img = get_pyramid(paths[0]).scaled(size).convert("RGBA")
+        for overlay_path in paths[1:]:
+            img.alpha_composite(get_pyramid(overlay_path).scaled(size).convert("RGBA"))
+        img = img.convert("RGB")
+    else:
+        bg_file = legacy_background_name(completed)
+        img_path = find_legacy_background(bg_file)
+        if img_path is None:
+            print(f"[EndScreen] ❌ Background {bg_file} not found")
+            return None
+        img = get_pyramid(img_path).scaled(size)
+
+    with _composites_lock:
+        _composites[key] = img
+        while len(_composites) > COMPOSITE_CACHE_SIZE:
+            _composites.popitem(last=False)
+    return img
+
+
+def prefetch_end_background(genre_progress, size):
+    """
+    Compose the end-screen background on a background thread so the end
+    screen can show it immediately.
+
+    Returns:
+        threading.Thread: The started daemon thread
+    """
+    def work():
+        try:
+            compose_end_background(genre_progress, size)
+        except Exception as e:
+            print(f"[EndScreen] ❌ Could not prefetch background: {e}")
+
+    thread = threading.Thread(target=work, name="EndScreenPrefetch", daemon=True)
+    thread.start()
+    return thread
+
 
 def show_enhanced_end_screen(parent_window, score, max_score, genre, on_play_again, on_home, genre_progress=None, on_continue=None):
     # Load progress if not provided
@@ -31,62 +162,12 @@ def show_enhanced_end_screen(parent_window, score, max_score, genre, on_play_aga
     canvas = tk.Canvas(parent_window, bg="#f5f0e8", width=w, height=h, highlightthickness=0)
     canvas.pack(fill=tk.BOTH, expand=True)
 
-    # 3. Choose background based on progress
-    completed = {k: v.get('completed', False) for k, v in genre_progress.items()}
-    
-    if all(completed.values()): 
-        bg_file = "library_all_clean"
-    elif completed.get('classic') and completed.get('romance'): 
-        bg_file = "library_classic_romance"
-    elif completed.get('classic') and completed.get('thriller'): 
-        bg_file = "library_classic_thriller"
-    elif completed.get('romance') and completed.get('thriller'): 
-        bg_file = "library_romance_thriller"
-    elif completed.get('classic'): 
-        bg_file = "library_classic_only"
-    elif completed.get('romance'): 
-        bg_file = "library_romance_only"
-    elif completed.get('thriller'): 
-        bg_file = "library_thriller_only"
-    else: 
-        bg_file = "library_all_messy"
-
-    # 4. Build path to image
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Try multiple possible paths
-    possible_paths = []
-    
-    # Path 1: src/ -> game/ -> GithubVersion/ -> artifacts/finalscores/
-    path1_base = os.path.join(script_dir, "..", "..", "artifacts", "finalscores")
-    possible_paths.append(os.path.join(path1_base, bg_file + ".png"))
-    possible_paths.append(os.path.join(path1_base, bg_file))
-    
-    # Path 2: Just in case structure is different
-    path2_base = os.path.join(script_dir, "..", "artifacts", "finalscores")
-    possible_paths.append(os.path.join(path2_base, bg_file + ".png"))
-    possible_paths.append(os.path.join(path2_base, bg_file))
-    
-    print(f"\n[EndScreen] Looking for background: {bg_file}")
-    
-    img_path = None
-    for path in possible_paths:
-        abs_path = os.path.abspath(path)
-        print(f"[EndScreen] Trying: {abs_path}")
-        if os.path.exists(abs_path):
-            img_path = abs_path
-            print(f"[EndScreen] ✅ FOUND: {abs_path}")
-            break
-    
-    if img_path is None:
-        print(f"[EndScreen] ❌ Image not found in any location!")
-
-    # 5. Load and display image
+    # 3-5. Background for this progress: base layer + one overlay per completed genre,
+    # or the matching pre-rendered PNG; usually already composited by prefetch_end_background
     image_loaded = False
     try:
-        if img_path and os.path.exists(img_path):
-            pil_img = Image.open(img_path)
-            pil_img = pil_img.resize((w, h), Image.Resampling.LANCZOS)
+        pil_img = compose_end_background(genre_progress, (w, h))
+        if pil_img is not None:
             bg_photo = ImageTk.PhotoImage(pil_img)
             canvas.create_image(0, 0, image=bg_photo, anchor='nw')
             canvas.image = bg_photo  # Keep reference
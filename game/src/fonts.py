@@ -0,0 +1,112 @@
+"""
+Fonts Module
+Resolves a usable font file for each face once per process
+(macOS Helvetica, a bundled TTF, fontconfig, then common Linux/Windows fonts)
+and caches FreeTypeFont objects per (face, size)
+"""
+
+import os
+import shutil
+import subprocess
+from functools import lru_cache
+
+from PIL import ImageFont
+
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+BUNDLED_FONTS_DIR = os.path.join(_script_dir, "..", "..", "artifacts", "fonts")
+
+HELVETICA_TTC = "/System/Library/Fonts/Helvetica.ttc"
+
+# Candidates are tried in order; each is (path, collection index).
+# The first one that loads is used for every size of that face.
+FONT_CANDIDATES = {
+    'regular': [
+        (HELVETICA_TTC, 0),
+        (os.path.join(BUNDLED_FONTS_DIR, "regular.ttf"), 0),
+        ("fontconfig:Helvetica", 0),
+        ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 0),
+        ("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf", 0),
+        ("C:\\Windows\\Fonts\\arial.ttf", 0),
+    ],
+    'bold': [
+        (HELVETICA_TTC, 1),
+        (os.path.join(BUNDLED_FONTS_DIR, "bold.ttf"), 0),
+        ("fontconfig:Helvetica:style=Bold", 0),
+        ("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 0),
+        ("/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf", 0),
+        ("C:\\Windows\\Fonts\\arialbd.ttf", 0),
+    ],
+    'oblique': [
+        (HELVETICA_TTC, 2),
+        (os.path.join(BUNDLED_FONTS_DIR, "oblique.ttf"), 0),
+        ("fontconfig:Helvetica:style=Oblique", 0),
+        ("/usr/share/fonts/truetype/dejavu/DejaVuSans-Oblique.ttf", 0),
+        ("/usr/share/fonts/truetype/liberation/LiberationSans-Italic.ttf", 0),
+        ("C:\\Windows\\Fonts\\ariali.ttf", 0),
+    ],
+}
+
+# Face to fall back on when none of a face's own candidates load
+FACE_FALLBACKS = {'bold': 'regular', 'oblique': 'regular'}
+
+
+def _fontconfig_match(pattern):
+    """Return the font file fontconfig picks for a pattern, or None without fc-match."""
+    if shutil.which("fc-match") is None:
+        return None
+    try:
+        result = subprocess.run(["fc-match", "-f", "%{file}", pattern],
+                                capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+@lru_cache(maxsize=None)
+def resolve_font(face='regular'):
+    """
+    Find the font file for a face, once per process.
+
+    Args:
+        face (str): 'regular', 'bold' or 'oblique'
+
+    Returns:
+        tuple: (path, index), or None if only Pillow's default font is available
+    """
+    for path, index in FONT_CANDIDATES.get(face, ()):
+        if path.startswith("fontconfig:"):
+            path = _fontconfig_match(path[len("fontconfig:"):])
+            if path is None:
+                continue
+        if not os.path.isfile(path):
+            continue
+        try:
+            ImageFont.truetype(path, 12, index=index)
+        except OSError:
+            continue
+        return path, index
+    fallback = FACE_FALLBACKS.get(face)
+    return resolve_font(fallback) if fallback else None
+
+
+@lru_cache(maxsize=256)
+def get_font(face='regular', size=12):
+    """
+    Return a cached font for (face, size).
+
+    Args:
+        face (str): 'regular', 'bold' or 'oblique'
+        size (int): Font size in pixels
+
+    Returns:
+        ImageFont.FreeTypeFont: The font (Pillow's default font if no file resolved)
+    """
+    resolved = resolve_font(face)
+    if resolved is None:
+        try:
+            return ImageFont.load_default(size)
+        except TypeError:  # Pillow < 10.1 only has the fixed-size bitmap font
+            return ImageFont.load_default()
+    path, index = resolved
+    return ImageFont.truetype(path, size, index=index)
@@ -5,9 +5,141 @@ Created from Hannah's gamebackground.py
 """
 
 import os
+import threading
+from collections import OrderedDict
+
 from PIL import Image, ImageTk
 
 
+MIN_LEVEL_SIDE = 128  # stop halving once a level would be smaller than this
+SCALED_CACHE_SIZE = 4
+PYRAMID_CACHE_SIZE = 8
+
+
+class MipmapPyramid:
+    """
+    An image plus successively halved copies of it.
+
+    `scaled(size)` resizes from the smallest level that is still at least as
+    large as the request (or returns a level that already has that size),
+    and remembers the last few results so an unchanged size costs nothing.
+    """
+
+    def __init__(self, image):
+        """
+        Args:
+            image (PIL.Image): Full-resolution image (decoded on first use)
+        """
+        self.image = image
+        self._levels = None
+        self._scaled = OrderedDict()
+        self._lock = threading.Lock()
+        self._decode_lock = threading.Lock()
+
+    @property
+    def levels(self):
+        """Full image first, then halved copies; built once, on first use from any thread."""
+        if self._levels is None:
+            with self._decode_lock:
+                if self._levels is None:
+                    self.image.load()
+                    levels = [self.image]
+                    while min(levels[-1].size) // 2 >= MIN_LEVEL_SIDE:
+                        levels.append(levels[-1].reduce(2))
+                    self._levels = levels
+        return self._levels
+
+    @classmethod
+    def open(cls, path):
+        """Open an image file and build its pyramid."""
+        return cls(Image.open(path))
+
+    @property
+    def size(self):
+        return self.image.size
+
+    def level_for(self, size):
+        """Return the smallest level that is at least `size` in both dimensions."""
+        width, height = size
+        for level in reversed(self.levels):
+            if level.width >= width and level.height >= height:
+                return level
+        return self.levels[0]
+
+    def scaled(self, size, resample=Image.Resampling.LANCZOS):
+        """
+        Return the image scaled to `size` (width, height).
+
+        Returns:
+            PIL.Image: A shared image; callers must not modify it
+        """
+        key = (tuple(size), resample)
+        with self._lock:
+            if key in self._scaled:
+                self._scaled.move_to_end(key)
+                return self._scaled[key]
+        level = self.level_for(size)
+        img = level if level.size == tuple(size) else level.resize(tuple(size), resample)
+        with self._lock:
+            self._scaled[key] = img
+            while len(self._scaled) > SCALED_CACHE_SIZE:
+                self._scaled.popitem(last=False)
+        return img
+
+
+_pyramids = OrderedDict()
+_pyramids_lock = threading.Lock()
+
+
+def get_pyramid(path):
+    """
+    Return the shared pyramid of an image file.
+    The most recently used PYRAMID_CACHE_SIZE pyramids are kept, decoded, across screens.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    path = os.path.abspath(path)
+    with _pyramids_lock:
+        pyramid = _pyramids.get(path)
+        if pyramid is None:
+            pyramid = _pyramids[path] = MipmapPyramid.open(path)
+            while len(_pyramids) > PYRAMID_CACHE_SIZE:
+                _pyramids.popitem(last=False)
+        else:
+            _pyramids.move_to_end(path)
+        return pyramid
+
+
+def preload_pyramids(paths, size=None):
+    """
+    Decode images (and scale them to `size`) on a background thread, so the
+    screens that show them later find everything ready.
+
+    Args:
+        paths: Image files to preload, most urgent first
+        size (tuple): (width, height) to pre-scale to, if known
+
+    Returns:
+        threading.Thread: The started daemon thread
+    """
+    paths = list(paths)
+
+    def work():
+        for path in paths:
+            try:
+                pyramid = get_pyramid(path)
+                pyramid.levels
+                if size is not None and size[0] > 1 and size[1] > 1:
+                    pyramid.scaled(size)
+            except Exception as e:
+                print(f"[backgroundhandler] ❌ Could not preload {path}: {e}")
+
+    thread = threading.Thread(target=work, name="PyramidPreload", daemon=True)
+    thread.start()
+    return thread
+
+
 class backgroundhandler:
     """Handles gameplay background image loading and display"""
     
@@ -25,6 +157,8 @@ class backgroundhandler:
         self.canvas_height = canvas_height
         self.original_bg_image = None
         self.bg_photo = None
+        self.pyramid = None
+        self._photo_size = None
     
     def load_background(self):
         """
@@ -60,7 +194,8 @@ class backgroundhandler:
             return False
         
         try:
-            self.original_bg_image = Image.open(bg_image_path)
+            self.pyramid = get_pyramid(bg_image_path)
+            self.original_bg_image = self.pyramid.image
             print("[backgroundhandler] ✅ Image loaded successfully!")
             return True
         except Exception as e:
@@ -89,9 +224,15 @@ class backgroundhandler:
             height = self.canvas_height
         
         try:
-            # Resize image to canvas size
-            resized_img = self.original_bg_image.resize((width, height), Image.Resampling.LANCZOS)
-            self.bg_photo = ImageTk.PhotoImage(resized_img)
+            # Same size as last time: the PhotoImage (and usually the item) can be reused
+            if self._photo_size == (width, height) and self.canvas.find_withtag("background"):
+                self.canvas.tag_lower("background")
+                return
+            if self._photo_size != (width, height):
+                # Resize from the nearest larger pyramid level
+                resized_img = self.pyramid.scaled((width, height))
+                self.bg_photo = ImageTk.PhotoImage(resized_img)
+                self._photo_size = (width, height)
             
             # Remove old background if exists
             self.canvas.delete("background")
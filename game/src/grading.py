@@ -0,0 +1,165 @@
+"""
+Batch Grading Module
+Grades many proposed shelf orderings at once with NumPy
+Reports exact matches plus Kendall-tau (inversion count) partial credit
+"""
+
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+from src.catalog import get_catalog
+from src.sort_rules import key_ranks as rule_key_ranks
+
+
+def read_orderings(path):
+    """
+    Read proposed orderings from a CSV or JSONL file.
+
+    CSV rows are `attempt_id,title_1,title_2,...`. JSONL lines are either
+    `{"id": ..., "order": [titles]}` or a bare list of titles.
+
+    Args:
+        path (str): Path to a .csv or .jsonl file
+
+    Returns:
+        list: (attempt_id, [titles]) pairs in file order
+    """
+    orderings = []
+    if os.path.splitext(path)[1].lower() in (".jsonl", ".ndjson"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                attempt = json.loads(line)
+                if isinstance(attempt, list):
+                    orderings.append((str(line_number), attempt))
+                else:
+                    orderings.append((str(attempt.get("id", line_number)), attempt.get("order", [])))
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.reader(f):
+                if row:
+                    orderings.append((row[0], [title for title in row[1:] if title]))
+    return orderings
+
+
+def count_inversions(ranks):
+    """
+    Count inversions in every row of a 2D rank array.
+
+    Each row is compressed to a permutation (ties keep their order, so equal
+    ranks never count), then swept left to right through a Fenwick tree held
+    as one (rows, n + 1) array. Every tree walk is vectorized across rows, so
+    the Python-level work is O(n log n) regardless of the number of rows.
+
+    Args:
+        ranks (np.ndarray): Integer array of shape (rows, n)
+
+    Returns:
+        np.ndarray: Inversion count per row
+    """
+    rows, n = ranks.shape
+    inversions = np.zeros(rows, dtype=np.int64)
+    if n < 2 or rows == 0:
+        return inversions
+
+    order = np.argsort(ranks, axis=1, kind="stable")
+    perm = np.empty_like(order)
+    row_idx = np.arange(rows)[:, None]
+    perm[row_idx, order] = np.arange(n)
+
+    tree = np.zeros((rows, n + 1), dtype=np.int64)
+    all_rows = np.arange(rows)
+    for j in range(n):
+        value = perm[:, j] + 1
+
+        # Prefix query: how many earlier values are <= value
+        seen = np.zeros(rows, dtype=np.int64)
+        idx = value.copy()
+        while idx.any():
+            seen += tree[all_rows, idx]
+            idx -= idx & -idx
+        inversions += j - seen
+
+        # Point update at value
+        idx = value.copy()
+        while True:
+            active = idx <= n
+            if not active.any():
+                break
+            tree[all_rows[active], idx[active]] += 1
+            idx = np.where(active, idx + (idx & -idx), idx)
+
+    return inversions
+
+
+def grade_orderings(orderings, sort_by='surname', catalog=None):
+    """
+    Grade proposed orderings against the alphabetical order of their books.
+
+    Args:
+        orderings: Iterable of (attempt_id, [titles]) pairs
+        sort_by (str): Name of a registered sort rule
+        catalog: BookCatalog to resolve titles with (defaults to the shared one)
+
+    Returns:
+        list: One dict per attempt, in input order, with keys
+              'id', 'valid', 'exact', 'inversions', 'score' and 'kendall_tau'
+    """
+    catalog = catalog or get_catalog()
+    key_ranks = rule_key_ranks(sort_by, catalog)
+
+    results = []
+    by_length = {}
+    for attempt_id, titles in orderings:
+        book_ids = [catalog.book_id(title) for title in titles]
+        result = {'id': attempt_id, 'valid': True, 'exact': False,
+                  'inversions': 0, 'score': 0.0, 'kendall_tau': 0.0}
+        results.append(result)
+        if None in book_ids:
+            result['valid'] = False
+            continue
+        by_length.setdefault(len(book_ids), []).append((result, [key_ranks[i] for i in book_ids]))
+
+    for n, group in by_length.items():
+        ranks = np.array([attempt_ranks for _, attempt_ranks in group], dtype=np.int64).reshape(len(group), n)
+        inversions = count_inversions(ranks)
+        exact = inversions == 0
+        max_inversions = n * (n - 1) // 2
+        if max_inversions:
+            score = 1.0 - inversions / max_inversions
+            tau = 1.0 - 2.0 * inversions / max_inversions
+        else:
+            score = tau = np.ones(len(group))
+
+        for row, (result, _) in enumerate(group):
+            result['exact'] = bool(exact[row])
+            result['inversions'] = int(inversions[row])
+            result['score'] = float(score[row])
+            result['kendall_tau'] = float(tau[row])
+
+    return results
+
+
+def main(argv=None):
+    """Grade a CSV/JSONL file of orderings and print the results as CSV."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python -m src.grading ORDERINGS.csv|ORDERINGS.jsonl [SORT_RULE]")
+        return 1
+    sort_by = argv[1] if len(argv) > 1 else 'surname'
+    results = grade_orderings(read_orderings(argv[0]), sort_by=sort_by)
+
+    writer = csv.DictWriter(sys.stdout, fieldnames=['id', 'valid', 'exact', 'inversions', 'score', 'kendall_tau'])
+    writer.writeheader()
+    writer.writerows(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Author Name Module
+Parses author names into given name, surname and suffix
+Builds casefolded, accent-free collation keys for alphabetical sorting
+"""
+
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+
+# Lower-case particles that belong to the surname ("Le Guin", "du Maurier", "van Gogh")
+SURNAME_PARTICLES = {
+    'al', 'bin', 'da', 'das', 'de', 'degli', 'dei', 'del', 'della', 'der', 'des', 'di',
+    'do', 'dos', 'du', 'el', 'ibn', 'la', 'le', 'les', 'lo', 'san', 'st', 'ste',
+    'saint', 'sainte', 'ten', 'ter', 'van', 'vande', 'vander', 'von', 'zu'
+}
+
+# Generational and honorific suffixes that are never the surname ("Jr.", "III")
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v', 'phd', 'md', 'esq'}
+
+
+class AuthorName(namedtuple('AuthorName', ['given', 'surname', 'suffix'])):
+    """Parsed author name: given names, surname (with particles) and suffix."""
+    __slots__ = ()
+
+    @property
+    def first_name(self):
+        """First given name, or the surname for single-word names ("Plato")."""
+        return self.given.split()[0] if self.given else self.surname
+
+
+def _bare(token):
+    """Lower-case a token and strip dots/commas for particle and suffix checks."""
+    return token.strip('.,').casefold()
+
+
+def parse_author_name(author):
+    """
+    Split a full author name into given name, surname and suffix.
+
+    Handles "Surname, Given" order, trailing suffixes ("Jr.", "III") and
+    surname particles ("Ursula K. Le Guin" -> "Le Guin").
+
+    Args:
+        author (str): Full author name
+
+    Returns:
+        AuthorName: The parsed name
+    """
+    author = " ".join(author.split())
+    suffix = ""
+
+    if "," in author:
+        head, _, tail = author.partition(",")
+        tail = tail.strip()
+        if tail and all(_bare(token) in NAME_SUFFIXES for token in tail.split()):
+            author, suffix = head.strip(), tail
+        elif tail:
+            # Inverted catalogue form: "Austen, Jane"
+            return AuthorName(tail, head.strip(), "")
+
+    tokens = author.split()
+    while len(tokens) > 1 and _bare(tokens[-1]) in NAME_SUFFIXES:
+        suffix = " ".join([tokens.pop()] + ([suffix] if suffix else []))
+
+    if not tokens:
+        return AuthorName("", "", suffix)
+
+    start = len(tokens) - 1
+    while start > 1 and _bare(tokens[start - 1]) in SURNAME_PARTICLES:
+        start -= 1
+
+    return AuthorName(" ".join(tokens[:start]), " ".join(tokens[start:]), suffix)
+
+
+def fold_name(text):
+    """
+    Normalize text for collation: strip accents, casefold, drop punctuation.
+
+    Args:
+        text (str): Text to normalize
+
+    Returns:
+        str: Collation form, e.g. "García Márquez" -> "garcia marquez"
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    chars = []
+    for char in decomposed:
+        if unicodedata.combining(char):
+            continue
+        chars.append(char if char.isalnum() else " ")
+    return " ".join("".join(chars).casefold().split())
+
+
+def compute_sort_keys(author, name=None):
+    """
+    Build the surname and first-name collation keys for an author.
+
+    Args:
+        author (str): Full author name
+        name (AuthorName): The name already split (e.g. from the database's
+            surname field); parsed from `author` if omitted
+
+    Returns:
+        tuple: (surname_key, first_name_key), each a tuple of folded strings
+    """
+    if name is None:
+        name = parse_author_name(author)
+    surname = fold_name(name.surname)
+    given = fold_name(name.given)
+    return (surname, given), (given or surname, surname)
+
+
+# Memoized variant for books that are not in the catalog
+author_sort_keys = lru_cache(maxsize=4096)(compute_sort_keys)
@@ -0,0 +1,122 @@
+"""
+Neighbours Module
+Sorted-key neighbour index over a genre's author sort keys
+Draws "hard" groups of books whose names share a long prefix and "easy"
+groups whose names all start with different letters, without scanning the genre
+"""
+
+import random
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+from src.catalog import get_catalog
+from src.sort_rules import get_sort_rule
+
+
+HARD_PREFIX = 3
+
+
+class NeighbourIndex:
+    """
+    A genre's book IDs sorted by the text players compare (e.g. folded surname).
+
+    Books sharing a prefix form one contiguous slice of `texts`, found with two
+    binary searches. Runs that share the first HARD_PREFIX letters ("hard"
+    clusters) and runs that share a first letter ("easy" buckets) are located
+    once when the index is built, so drawing a group costs O(log n + count).
+    """
+
+    def __init__(self, genre, sort_by='surname', catalog=None, hard_prefix=HARD_PREFIX):
+        """
+        Args:
+            genre (str): Genre to index
+            sort_by (str): Name of a registered sort rule
+            catalog: BookCatalog (defaults to the shared one)
+            hard_prefix (int): Letters hard clusters must share
+        """
+        catalog = catalog or get_catalog()
+        rule = get_sort_rule(sort_by)
+        keys = rule.key_column(catalog)
+        pairs = sorted((rule.prefix_text(keys[book_id]), book_id)
+                       for book_id in catalog.ids_by_genre(genre))
+        self.texts = [text for text, _ in pairs]
+        self.ids = [book_id for _, book_id in pairs]
+        self.hard_prefix = hard_prefix
+
+        self.clusters = [run for run in self._runs(hard_prefix)
+                         if len(self.texts[run[0]]) >= hard_prefix]
+        self.buckets = [run for run in self._runs(1) if self.texts[run[0]]]
+        self._eligible = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _runs(self, length):
+        """Return (lo, hi) slices of `texts` that share their first `length` characters."""
+        runs = []
+        lo = 0
+        for hi in range(1, len(self.texts) + 1):
+            if hi == len(self.texts) or self.texts[hi][:length] != self.texts[lo][:length]:
+                runs.append((lo, hi))
+                lo = hi
+        return runs
+
+    def prefix_range(self, prefix):
+        """
+        Return the (lo, hi) slice of `texts` / `ids` whose text starts with `prefix`.
+        """
+        lo = bisect_left(self.texts, prefix)
+        hi = bisect_left(self.texts, prefix + "\uffff", lo)
+        return lo, hi
+
+    def ids_with_prefix(self, prefix):
+        """Return the IDs of every book whose text starts with `prefix`."""
+        lo, hi = self.prefix_range(prefix)
+        return self.ids[lo:hi]
+
+    def hard_ids(self, count, rng=random):
+        """
+        Draw `count` books that all share a HARD_PREFIX-letter prefix.
+
+        Clusters are picked in proportion to their size. If no cluster is big
+        enough, the closest run of `count` neighbours in sorted order is used.
+
+        Returns:
+            list: Book IDs in random order
+        """
+        count = min(count, len(self.ids))
+        if count == 0:
+            return []
+        if count not in self._eligible:
+            eligible = [run for run in self.clusters if run[1] - run[0] >= count]
+            self._eligible[count] = (eligible, list(accumulate(hi - lo for lo, hi in eligible)))
+        eligible, totals = self._eligible[count]
+
+        if eligible:
+            lo, hi = eligible[bisect_right(totals, rng.randrange(totals[-1]))]
+            positions = rng.sample(range(lo, hi), count)
+        else:
+            start = rng.randrange(len(self.ids) - count + 1)
+            positions = rng.sample(range(start, start + count), count)
+        return [self.ids[position] for position in positions]
+
+    def easy_ids(self, count, rng=random):
+        """
+        Draw `count` books whose texts all start with different letters,
+        falling back to a uniform draw when the genre has too few letters.
+
+        Returns:
+            list: Book IDs in random order
+        """
+        count = min(count, len(self.ids))
+        if len(self.buckets) < count:
+            return [self.ids[position] for position in rng.sample(range(len(self.ids)), count)]
+        return [self.ids[rng.randrange(lo, hi)] for lo, hi in rng.sample(self.buckets, count)]
+
+
+def neighbour_index(genre, sort_by='surname', catalog=None):
+    """Return the NeighbourIndex of a genre under a rule, built once per catalog."""
+    catalog = catalog or get_catalog()
+    genre = genre.lower()
+    return catalog.derived(f"neighbours:{sort_by}:{genre}",
+                           lambda cat: NeighbourIndex(genre, sort_by, cat))
@@ -2,6 +2,8 @@
 Notifications Module - Canvas Overlay Version
 Shows pop-ups directly on the game canvas as overlays
 No separate windows!
+Feedback sprites are decoded and scaled once and shared by every popup, and
+each popup is built once per canvas and then only shown and hidden
 """
 
 import tkinter as tk
@@ -9,262 +11,353 @@ from PIL import Image, ImageTk
 import os
 
 
-def show_geese_popup_overlay(canvas, root, score, message="Perfect! 🎉", on_close=None):
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+SPRITES_DIR = os.path.join(_script_dir, "..", "..", "artifacts", "progress")
+
+# name: (file, popup size)
+FEEDBACK_SPRITES = {
+    'good': ("good.png", (180, 180)),
+    'bad': ("bad.png", (160, 160)),
+}
+
+
+class SpriteRegistry:
     """
-    Show a geese pop-up as an overlay on the canvas, perfectly centered.
-    
-    Args:
-        canvas: The game canvas to draw on
-        root: The root window
-        score (int): Current score to display
-        message (str): Message to show
-        on_close (function): Callback when popup is closed
+    Shared PhotoImages of the popup sprites, each decoded and resized once per process.
+    A sprite whose file cannot be loaded is remembered as missing, so popups
+    fall back to emoji without retrying the disk.
     """
-    # Get canvas dimensions
-    canvas.update_idletasks()
-    canvas_width = canvas.winfo_width() if canvas.winfo_width() > 1 else 1200
-    canvas_height = canvas.winfo_height() if canvas.winfo_height() > 1 else 900
-    
-    # Calculate centered popup dimensions
+
+    def __init__(self, sprites=FEEDBACK_SPRITES, sprites_dir=SPRITES_DIR):
+        """
+        Args:
+            sprites (dict): name -> (file name, (width, height))
+            sprites_dir (str): Folder holding the sprite files
+        """
+        self.sprites = dict(sprites)
+        self.sprites_dir = sprites_dir
+        self._photos = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self, name):
+        """Decode and resize a sprite once; a failure is cached as None."""
+        if name not in self._photos:
+            filename, size = self.sprites[name]
+            try:
+                img = Image.open(os.path.join(self.sprites_dir, filename))
+                self._photos[name] = ImageTk.PhotoImage(img.resize(size, Image.Resampling.LANCZOS))
+            except Exception as e:
+                print(f"[Notifications] ❌ Could not load sprite '{name}': {e}")
+                self._photos[name] = None
+        return self._photos[name]
+
+    def photo(self, name):
+        """
+        Return the shared PhotoImage of a sprite (call from the Tk thread).
+
+        Returns:
+            ImageTk.PhotoImage: The sprite, or None if its file could not be loaded
+        """
+        if name in self._photos:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return self._load(name)
+
+    def warm_up(self, root):
+        """Load every sprite the next time the Tk event loop is idle."""
+        def work():
+            for name in self.sprites:
+                self._load(name)
+        root.after_idle(work)
+
+    def clear(self):
+        """Drop every loaded sprite (counters are kept)."""
+        self._photos.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: loaded sprites, hits and misses
+        """
+        return {
+            'loaded': sorted(name for name, photo in self._photos.items() if photo is not None),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+sprites = SpriteRegistry()
+
+
+def warm_up_sprites(root):
+    """Decode the feedback sprites during idle time, before the first answer."""
+    sprites.warm_up(root)
+
+
+POPUP_TAG = "popup"
+
+
+def _canvas_center(canvas):
+    """Centre of the canvas, from its configured size until it has been mapped (no layout flush)."""
+    width, height = canvas.winfo_width(), canvas.winfo_height()
+    if width <= 1 or height <= 1:
+        width, height = int(canvas.cget("width")), int(canvas.cget("height"))
+    return width // 2, height // 2
+
+
+def _build_popup_button(canvas, center_x, top, text, fill, tags):
+    """Create a 160x50 button (rectangle + label) and return its two items."""
+    btn_width = 160
+    btn_height = 50
+    btn_x1 = center_x - btn_width // 2
+    btn_bg = canvas.create_rectangle(
+        btn_x1, top, btn_x1 + btn_width, top + btn_height,
+        fill=fill,
+        outline="#3d2817",
+        width=2,
+        tags=tags
+    )
+    btn_text = canvas.create_text(
+        center_x, top + btn_height // 2,
+        text=text,
+        font=("Georgia", 16, "bold"),
+        fill="white",
+        tags=tags
+    )
+    return [btn_bg, btn_text]
+
+
+def _build_geese_popup(canvas, center, tags):
+    """Create the (hidden) correct-answer popup centred on `center`."""
     popup_width = 500
     popup_height = 450
-    popup_x1 = (canvas_width - popup_width) // 2
-    popup_y1 = (canvas_height - popup_height) // 2
-    popup_x2 = popup_x1 + popup_width
-    popup_y2 = popup_y1 + popup_height
-    center_x = canvas_width // 2
-    
-    # Create popup box - centered
-    popup_box = canvas.create_rectangle(
-        popup_x1, popup_y1, popup_x2, popup_y2,
+    center_x, center_y = center
+    popup_x1 = center_x - popup_width // 2
+    popup_y1 = center_y - popup_height // 2
+    items = {}
+
+    items['box'] = canvas.create_rectangle(
+        popup_x1, popup_y1, popup_x1 + popup_width, popup_y1 + popup_height,
         fill="#f5f0e8",
         outline="#2d5016",
         width=5,
-        tags="popup"
+        tags=tags
     )
-    
-    # Try to load good image (correct answer)
-    try:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        good_path = os.path.join(script_dir, "..", "..", "artifacts", "progress", "good.png")
-        good_img = Image.open(good_path)
-        good_img = good_img.resize((180, 180), Image.Resampling.LANCZOS)
-        good_photo = ImageTk.PhotoImage(good_img)
-        
-        # Store reference to prevent garbage collection
-        if not hasattr(canvas, '_popup_images'):
-            canvas._popup_images = []
-        canvas._popup_images.append(good_photo)
-        
-        canvas.create_image(center_x, popup_y1 + 110, image=good_photo, tags="popup")
-    except:
+
+    # Good image (correct answer); the registry keeps the PhotoImage alive
+    good_photo = sprites.photo('good')
+    if good_photo is not None:
+        canvas.create_image(center_x, popup_y1 + 110, image=good_photo, tags=tags)
+    else:
         # Fallback: Use emoji
-        canvas.create_text(
-            center_x, popup_y1 + 110,
-            text="🪿✨",
-            font=("Arial", 50),
-            tags="popup"
-        )
-    
-    # Message
-    canvas.create_text(
+        canvas.create_text(center_x, popup_y1 + 110, text="🪿✨", font=("Arial", 50), tags=tags)
+
+    items['message'] = canvas.create_text(
         center_x, popup_y1 + 230,
-        text=message,
+        text="",
         font=("Georgia", 20, "bold"),
         fill="#2d5016",
         width=popup_width - 40,
-        tags="popup"
+        tags=tags
     )
-    
-    # Score
     canvas.create_text(
         center_x, popup_y1 + 290,
-        text=f"+10 points!",
+        text="+10 points!",
         font=("Georgia", 18, "bold"),
         fill="#4a7c8c",
-        tags="popup"
+        tags=tags
     )
-    
-    canvas.create_text(
+    items['score'] = canvas.create_text(
         center_x, popup_y1 + 320,
-        text=f"Score: {score}",
+        text="",
         font=("Georgia", 16),
         fill="#4a7c8c",
-        tags="popup"
-    )
-    
-    # Continue button - centered
-    btn_width = 160
-    btn_height = 50
-    btn_x1 = center_x - btn_width // 2
-    btn_y1 = popup_y1 + 360
-    btn_x2 = btn_x1 + btn_width
-    btn_y2 = btn_y1 + btn_height
-    
-    btn_bg = canvas.create_rectangle(
-        btn_x1, btn_y1, btn_x2, btn_y2,
-        fill="#4a7c8c",
-        outline="#3d2817",
-        width=2,
-        tags="popup"
+        tags=tags
     )
-    
-    btn_text = canvas.create_text(
-        center_x, btn_y1 + btn_height // 2,
-        text="Continue",
-        font=("Georgia", 16, "bold"),
-        fill="white",
-        tags="popup"
-    )
-    
-    def close_popup(event=None):
-        canvas.delete("popup")
-        if hasattr(canvas, '_popup_images'):
-            canvas._popup_images.clear()
-        root.unbind("<Return>")
-        if on_close:
-            on_close()
-    
-    # Make button clickable
-    canvas.tag_bind(btn_bg, "<Button-1>", close_popup)
-    canvas.tag_bind(btn_text, "<Button-1>", close_popup)
-    
-    # Also allow Enter key to close
-    root.bind("<Return>", close_popup)
+    items['buttons'] = _build_popup_button(canvas, center_x, popup_y1 + 360, "Continue", "#4a7c8c", tags)
+    return items
 
 
-def show_librarian_angry_overlay(canvas, root, correct_order_text, on_close=None):
-    """
-    Show angry librarian pop-up as an overlay on the canvas, perfectly centered.
-    
-    Args:
-        canvas: The game canvas to draw on
-        root: The root window
-        correct_order_text (str): The correct book order to display
-        on_close (function): Callback when popup is closed
-    """
-    # Get canvas dimensions
-    canvas.update_idletasks()
-    canvas_width = canvas.winfo_width() if canvas.winfo_width() > 1 else 1200
-    canvas_height = canvas.winfo_height() if canvas.winfo_height() > 1 else 900
-    
-    # Calculate centered popup dimensions (taller for book list)
+def _build_librarian_popup(canvas, center, tags):
+    """Create the (hidden) wrong-answer popup centred on `center`."""
     popup_width = 600
     popup_height = 600
-    popup_x1 = (canvas_width - popup_width) // 2
-    popup_y1 = (canvas_height - popup_height) // 2
+    center_x, center_y = center
+    popup_x1 = center_x - popup_width // 2
+    popup_y1 = center_y - popup_height // 2
     popup_x2 = popup_x1 + popup_width
-    popup_y2 = popup_y1 + popup_height
-    center_x = canvas_width // 2
-    
-    # Create popup box
-    popup_box = canvas.create_rectangle(
-        popup_x1, popup_y1, popup_x2, popup_y2,
+    items = {}
+
+    items['box'] = canvas.create_rectangle(
+        popup_x1, popup_y1, popup_x2, popup_y1 + popup_height,
         fill="#f5f0e8",
         outline="#8b0000",
         width=5,
-        tags="popup"
+        tags=tags
     )
-    
-    # Try to load bad image (wrong answer)
-    try:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        bad_path = os.path.join(script_dir, "..", "..", "artifacts", "progress", "bad.png")
-        bad_img = Image.open(bad_path)
-        bad_img = bad_img.resize((160, 160), Image.Resampling.LANCZOS)
-        bad_photo = ImageTk.PhotoImage(bad_img)
-        
-        # Store reference
-        if not hasattr(canvas, '_popup_images'):
-            canvas._popup_images = []
-        canvas._popup_images.append(bad_photo)
-        
-        canvas.create_image(center_x, popup_y1 + 100, image=bad_photo, tags="popup")
-    except:
+
+    # Bad image (wrong answer); the registry keeps the PhotoImage alive
+    bad_photo = sprites.photo('bad')
+    if bad_photo is not None:
+        canvas.create_image(center_x, popup_y1 + 100, image=bad_photo, tags=tags)
+    else:
         # Fallback: Angry emoji
-        canvas.create_text(
-            center_x, popup_y1 + 100,
-            text="😤📚",
-            font=("Arial", 50),
-            tags="popup"
-        )
-    
-    # Angry message
+        canvas.create_text(center_x, popup_y1 + 100, text="😤📚", font=("Arial", 50), tags=tags)
+
     canvas.create_text(
         center_x, popup_y1 + 200,
         text="Not quite right!",
         font=("Georgia", 20, "bold"),
         fill="#8b0000",
         width=popup_width - 60,
-        tags="popup"
+        tags=tags
     )
-    
-    # Subtitle
     canvas.create_text(
         center_x, popup_y1 + 240,
         text="Here's the correct order:",
         font=("Georgia", 14, "italic"),
         fill="#3d2817",
-        tags="popup"
+        tags=tags
     )
-    
-    # Correct order box
-    order_box = canvas.create_rectangle(
+    canvas.create_rectangle(
         popup_x1 + 40, popup_y1 + 270,
         popup_x2 - 40, popup_y1 + 470,
         fill="#ffffff",
         outline="#3d2817",
         width=2,
-        tags="popup"
+        tags=tags
     )
-    
-    canvas.create_text(
+    items['order'] = canvas.create_text(
         center_x, popup_y1 + 370,
-        text=correct_order_text,
+        text="",
         font=("Georgia", 12),
         fill="#3d2817",
         width=popup_width - 100,
-        tags="popup"
+        tags=tags
     )
-    
-    # Try Again button - centered
-    btn_width = 160
-    btn_height = 50
-    btn_x1 = center_x - btn_width // 2
-    btn_y1 = popup_y1 + 510
-    btn_x2 = btn_x1 + btn_width
-    btn_y2 = btn_y1 + btn_height
-    
-    btn_bg = canvas.create_rectangle(
-        btn_x1, btn_y1, btn_x2, btn_y2,
-        fill="#8b0000",
-        outline="#3d2817",
-        width=2,
-        tags="popup"
-    )
-    
-    btn_text = canvas.create_text(
-        center_x, btn_y1 + btn_height // 2,
-        text="Try Again",
-        font=("Georgia", 16, "bold"),
-        fill="white",
-        tags="popup"
-    )
-    
-    def close_popup(event=None):
-        canvas.delete("popup")
-        if hasattr(canvas, '_popup_images'):
-            canvas._popup_images.clear()
-        root.unbind("<Return>")
+    items['buttons'] = _build_popup_button(canvas, center_x, popup_y1 + 510, "Try Again", "#8b0000", tags)
+    return items
+
+
+POPUP_BUILDERS = {
+    'geese': _build_geese_popup,
+    'librarian': _build_librarian_popup,
+}
+
+
+class PopupOverlay:
+    """
+    A popup kept on its canvas as a hidden group of items. Showing it only
+    updates its texts and flips the group's state; the items are created
+    again only if something deleted them.
+    """
+
+    def __init__(self, canvas, kind):
+        """
+        Args:
+            canvas: The game canvas to draw on
+            kind (str): A key of POPUP_BUILDERS
+        """
+        self.canvas = canvas
+        self.build = POPUP_BUILDERS[kind]
+        self.tag = f"popup_{kind}"
+        self.items = {}
+        self.center = None
+        self.root = None
+        self.on_close = None
+        self.builds = 0
+
+    def _alive(self):
+        """True if the popup's items are still on the canvas."""
+        return bool(self.items) and bool(self.canvas.type(self.items['box']))
+
+    def prepare(self):
+        """Create the hidden items if needed and keep them centred on the canvas."""
+        center = _canvas_center(self.canvas)
+        if not self._alive():
+            self.canvas.delete(self.tag)  # leftovers of a partly deleted group
+            self.items = self.build(self.canvas, center, (POPUP_TAG, self.tag))
+            self.canvas.itemconfigure(self.tag, state="hidden")
+            for item in self.items['buttons']:
+                self.canvas.tag_bind(item, "<Button-1>", self.close)
+            self.center = center
+            self.builds += 1
+        elif center != self.center:
+            self.canvas.move(self.tag, center[0] - self.center[0], center[1] - self.center[1])
+            self.center = center
+
+    def show(self, root, on_close=None, **texts):
+        """
+        Show the popup with new texts (keyword = item name, e.g. score="Score: 10").
+
+        Args:
+            root: The root window (Enter closes the popup)
+            on_close (function): Callback when popup is closed
+        """
+        self.prepare()
+        for name, text in texts.items():
+            self.canvas.itemconfigure(self.items[name], text=text)
+        self.root = root
+        self.on_close = on_close
+        self.canvas.itemconfigure(self.tag, state="normal")
+        self.canvas.tag_raise(self.tag)
+        root.bind("<Return>", self.close)
+
+    def close(self, event=None):
+        """Hide the popup and run its callback (once, even on a double Enter/click)."""
+        if self.root is None:
+            return
+        self.canvas.itemconfigure(self.tag, state="hidden")
+        self.root.unbind("<Return>")
+        on_close = self.on_close
+        self.root = None
+        self.on_close = None
         if on_close:
             on_close()
+
+
+def popup_overlay(canvas, kind):
+    """Return the canvas's PopupOverlay of a kind, creating it on first use."""
+    if not hasattr(canvas, '_popup_overlays'):
+        canvas._popup_overlays = {}
+    if kind not in canvas._popup_overlays:
+        canvas._popup_overlays[kind] = PopupOverlay(canvas, kind)
+    return canvas._popup_overlays[kind]
+
+
+def prepare_popup_overlays(canvas):
+    """Build every popup on a new game canvas, hidden, before the first answer."""
+    for kind in POPUP_BUILDERS:
+        popup_overlay(canvas, kind).prepare()
+
+
+def show_geese_popup_overlay(canvas, root, score, message="Perfect! 🎉", on_close=None):
+    """
+    Show a geese pop-up as an overlay on the canvas, perfectly centered.
     
-    # Make button clickable
-    canvas.tag_bind(btn_bg, "<Button-1>", close_popup)
-    canvas.tag_bind(btn_text, "<Button-1>", close_popup)
+    Args:
+        canvas: The game canvas to draw on
+        root: The root window
+        score (int): Current score to display
+        message (str): Message to show
+        on_close (function): Callback when popup is closed
+    """
+    popup_overlay(canvas, 'geese').show(root, on_close, message=message, score=f"Score: {score}")
+
+
+def show_librarian_angry_overlay(canvas, root, correct_order_text, on_close=None):
+    """
+    Show angry librarian pop-up as an overlay on the canvas, perfectly centered.
     
-    # Also allow Enter key to close
-    root.bind("<Return>", close_popup)
+    Args:
+        canvas: The game canvas to draw on
+        root: The root window
+        correct_order_text (str): The correct book order to display
+        on_close (function): Callback when popup is closed
+    """
+    popup_overlay(canvas, 'librarian').show(root, on_close, order=correct_order_text)
 
 
 def show_simple_message(message_type, title, message):
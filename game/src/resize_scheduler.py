@@ -0,0 +1,100 @@
+"""
+Resize Scheduler Module
+Coalesces bursts of <Configure> events for full-window images: while the
+window is being resized the image is redrawn with a fast filter at most once
+per event-loop pass, and once the size settles it gets one LANCZOS pass.
+The image is shown by a single canvas item that is updated in place.
+"""
+
+from PIL import Image, ImageTk
+
+
+SETTLE_MS = 150
+FAST_RESAMPLE = Image.Resampling.BILINEAR
+FINAL_RESAMPLE = Image.Resampling.LANCZOS
+
+
+class ResizeScheduler:
+    """Keeps one canvas image item sized to its canvas."""
+
+    def __init__(self, root, canvas, pyramid=None, on_layout=None, tag="screen_image",
+                 settle_ms=SETTLE_MS):
+        """
+        Args:
+            root: Tk root used to schedule redraws
+            canvas: Canvas the image fills
+            pyramid: MipmapPyramid of the image to show (can be set later)
+            on_layout (function): Called with (width, height) after each redraw,
+                to reposition buttons and other items
+            tag (str): Canvas tag of the image item
+            settle_ms (int): Quiet time before the high-quality pass
+        """
+        self.root = root
+        self.canvas = canvas
+        self.pyramid = pyramid
+        self.on_layout = on_layout
+        self.tag = tag
+        self.settle_ms = settle_ms
+        self.photo = None
+        self.item = None
+        self.size = None
+        self.rendered = None  # (size, resample) currently on screen
+        self._fast_job = None
+        self._final_job = None
+
+    def schedule(self, event):
+        """<Configure> handler: coalesce the event into the pending redraws."""
+        self.size = (event.width, event.height)
+        if self.rendered == (self.size, FINAL_RESAMPLE):
+            return
+        if self._fast_job is None:
+            self._fast_job = self.root.after_idle(self._fast_pass)
+        if self._final_job is not None:
+            self.root.after_cancel(self._final_job)
+        self._final_job = self.root.after(self.settle_ms, self._final_pass)
+
+    def _fast_pass(self):
+        self._fast_job = None
+        self.render(FAST_RESAMPLE)
+
+    def _final_pass(self):
+        self._final_job = None
+        self.render(FINAL_RESAMPLE)
+
+    def cancel(self):
+        """Drop any pending redraws; call before the canvas is destroyed."""
+        if self._fast_job is not None:
+            self.root.after_cancel(self._fast_job)
+            self._fast_job = None
+        if self._final_job is not None:
+            self.root.after_cancel(self._final_job)
+            self._final_job = None
+
+    def set_pyramid(self, pyramid, size=None):
+        """Show a different image, drawing it at full quality right away."""
+        self.pyramid = pyramid
+        self.rendered = None
+        if size is not None:
+            self.size = tuple(size)
+        self.render(FINAL_RESAMPLE)
+
+    def render(self, resample=FINAL_RESAMPLE):
+        """Draw the image at the current size into the persistent canvas item."""
+        if self.pyramid is None or self.size is None:
+            return
+        width, height = self.size
+        if width <= 1 or height <= 1 or not self.canvas.winfo_exists():
+            return
+        try:
+            if self.rendered != (self.size, resample):
+                self.photo = ImageTk.PhotoImage(self.pyramid.scaled(self.size, resample))
+                self.rendered = (self.size, resample)
+            if self.item is not None and self.canvas.type(self.item):
+                self.canvas.itemconfigure(self.item, image=self.photo)
+            else:
+                self.item = self.canvas.create_image(0, 0, image=self.photo, anchor='nw', tags=self.tag)
+            self.canvas.tag_lower(self.item)
+        except Exception as e:
+            print(f"[ResizeScheduler] ❌ Error drawing image: {e}")
+        if self.on_layout is not None:
+            self.on_layout(width, height)
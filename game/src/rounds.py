@@ -0,0 +1,266 @@
+"""
+Rounds Module
+Generates game rounds by sampling book IDs directly (no list copies or shuffles)
+and keeps a bank of pre-generated, pre-validated rounds filled in the background
+"""
+
+import os
+import random
+import struct
+import threading
+from bisect import bisect_right
+from collections import deque, namedtuple
+
+from src.catalog import get_catalog
+from src.neighbours import neighbour_index
+from src.sort_rules import get_sort_rule
+
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+PUZZLE_BANK_PATH = os.path.join(_script_dir, "..", "..", "artifacts", "puzzle_bank.bin")
+
+BOOKS_TO_PLACE = 5
+SHELF_SIZE = 4
+
+# normal: uniform draw; hard: every name shares a 3+ letter prefix;
+# easy: every name starts with a different letter
+DIFFICULTIES = ('easy', 'normal', 'hard')
+
+
+# place_ids: books to place, in play order; shelf_ids: starting shelf in sorted order;
+# answers: correct slot of each placed book, given every earlier one was shelved correctly
+Round = namedtuple('Round', ['genre', 'sort_by', 'place_ids', 'shelf_ids', 'answers', 'difficulty'],
+                   defaults=('normal',))
+
+
+def _solve(place_ids, shelf_ids, sort_by, catalog):
+    """Sort the shelf and compute the correct slot of each book to place."""
+    keys = get_sort_rule(sort_by).key_column(catalog)
+    shelf_ids = sorted(shelf_ids, key=keys.__getitem__)
+    shelf_keys = [keys[book_id] for book_id in shelf_ids]
+    answers = []
+    for book_id in place_ids:
+        slot = bisect_right(shelf_keys, keys[book_id])
+        shelf_keys.insert(slot, keys[book_id])
+        answers.append(slot)
+    return tuple(shelf_ids), tuple(answers)
+
+
+def generate_round(genre, sort_by='surname', n_place=BOOKS_TO_PLACE, n_shelf=SHELF_SIZE,
+                   rng=random, catalog=None, difficulty='normal'):
+    """
+    Build one round by sampling book IDs from the genre's ID range
+    (or from its neighbour index for easy and hard rounds).
+
+    Args:
+        genre (str): Genre to draw from
+        sort_by (str): Name of a registered sort rule
+        n_place (int): Books the player has to place
+        n_shelf (int): Books already on the shelf
+        rng: random.Random-like source
+        catalog: BookCatalog (defaults to the shared one)
+        difficulty (str): One of DIFFICULTIES
+
+    Returns:
+        Round: The generated round (smaller if the genre has too few books)
+
+    Raises:
+        ValueError: If the difficulty is unknown
+    """
+    catalog = catalog or get_catalog()
+    count = n_place + n_shelf
+    if difficulty == 'normal':
+        ids = catalog.ids_by_genre(genre)
+        picked = rng.sample(ids, min(count, len(ids)))
+    elif difficulty == 'hard':
+        picked = neighbour_index(genre, sort_by, catalog).hard_ids(count, rng)
+    elif difficulty == 'easy':
+        picked = neighbour_index(genre, sort_by, catalog).easy_ids(count, rng)
+    else:
+        raise ValueError(f"Unknown difficulty: {difficulty!r} (known: {', '.join(DIFFICULTIES)})")
+    place_ids = tuple(picked[:n_place])
+    shelf_ids, answers = _solve(place_ids, picked[n_place:], sort_by, catalog)
+    return Round(genre.lower(), sort_by, place_ids, shelf_ids, answers, difficulty)
+
+
+def validate_round(round_, catalog=None):
+    """
+    Check that a round still matches the catalog: distinct in-genre IDs,
+    a sorted shelf and correct answers.
+
+    Returns:
+        bool: True if the round can be served as-is
+    """
+    catalog = catalog or get_catalog()
+    ids = catalog.ids_by_genre(round_.genre)
+    all_ids = round_.place_ids + round_.shelf_ids
+    if len(set(all_ids)) != len(all_ids) or any(book_id not in ids for book_id in all_ids):
+        return False
+    try:
+        return _solve(round_.place_ids, round_.shelf_ids, round_.sort_by, catalog) == (
+            tuple(round_.shelf_ids), tuple(round_.answers))
+    except ValueError:
+        return False
+
+
+class PuzzleBank:
+    """
+    Bank of ready-to-play rounds per (genre, sort_by, difficulty).
+
+    `take` pops a round in O(1) and falls back to generating one on the spot
+    when the bank is empty. A daemon worker tops every key back up to
+    `per_key` rounds and persists the bank to a compact binary file.
+    """
+
+    MAGIC = b"DWYP"
+    VERSION = 2
+    HEADER = struct.Struct("<4sHI")       # magic, version, round count
+    ROUND_HEADER = struct.Struct("<BBBBB")  # genre, rule and difficulty lengths, n_place, n_shelf
+
+    def __init__(self, path=PUZZLE_BANK_PATH, per_key=16, catalog=None):
+        """
+        Args:
+            path (str): Bank file to load from and save to (None to keep it in memory)
+            per_key (int): Rounds kept ready for each (genre, sort_by, difficulty)
+            catalog: BookCatalog (defaults to the shared one)
+        """
+        self.path = path
+        self.per_key = per_key
+        self.catalog = catalog
+        self.rng = random.Random()
+        self._rounds = {}
+        self._lock = threading.Lock()
+        self._wanted = threading.Event()
+        self._worker = None
+        self._stopping = False
+
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def _queue(self, genre, sort_by, difficulty='normal'):
+        return self._rounds.setdefault((genre.lower(), sort_by, difficulty), deque())
+
+    def take(self, genre, sort_by='surname', difficulty='normal'):
+        """Return a ready round for (genre, sort_by, difficulty), generating one if none is banked."""
+        with self._lock:
+            queue = self._queue(genre, sort_by, difficulty)
+            round_ = queue.popleft() if queue else None
+        self._wanted.set()
+        if round_ is None:
+            round_ = generate_round(genre, sort_by, rng=self.rng, catalog=self.catalog,
+                                    difficulty=difficulty)
+        return round_
+
+    def peek(self, genre, sort_by='surname', difficulty='normal'):
+        """Return the round `take` will serve next, or None if none is banked."""
+        with self._lock:
+            queue = self._queue(genre, sort_by, difficulty)
+            return queue[0] if queue else None
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(queue) for queue in self._rounds.values())
+
+    def fill(self, genre, sort_by='surname', difficulty='normal'):
+        """Top one (genre, sort_by, difficulty) queue up to per_key rounds. Returns rounds added."""
+        added = 0
+        while not self._stopping:
+            with self._lock:
+                if len(self._queue(genre, sort_by, difficulty)) >= self.per_key:
+                    break
+            round_ = generate_round(genre, sort_by, rng=self.rng, catalog=self.catalog,
+                                    difficulty=difficulty)
+            if len(round_.place_ids) == 0:
+                break
+            with self._lock:
+                self._queue(genre, sort_by, difficulty).append(round_)
+            added += 1
+        return added
+
+    def start(self, genres=('classic', 'romance', 'thriller'), sort_rules=('surname',),
+              difficulties=('normal',)):
+        """Start the background worker that keeps every (genre, rule, difficulty) queue full."""
+        if self._worker is not None:
+            return
+        self._stopping = False
+
+        def work():
+            while not self._stopping:
+                added = sum(self.fill(genre, sort_by, difficulty)
+                            for genre in genres for sort_by in sort_rules for difficulty in difficulties)
+                if added and self.path:
+                    try:
+                        self.save(self.path)
+                    except OSError as e:
+                        print(f"[PuzzleBank] Could not save {self.path}: {e}")
+                self._wanted.wait()
+                self._wanted.clear()
+
+        self._wanted.set()
+        self._worker = threading.Thread(target=work, name="PuzzleBank", daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        """Ask the background worker to finish."""
+        self._stopping = True
+        self._wanted.set()
+        self._worker = None
+
+    def save(self, path):
+        """Write every banked round to a compact binary file."""
+        with self._lock:
+            rounds = [round_ for queue in self._rounds.values() for round_ in queue]
+        chunks = [self.HEADER.pack(self.MAGIC, self.VERSION, len(rounds))]
+        for round_ in rounds:
+            genre = round_.genre.encode("utf-8")
+            sort_by = round_.sort_by.encode("utf-8")
+            difficulty = round_.difficulty.encode("utf-8")
+            ids = round_.place_ids + round_.shelf_ids
+            chunks.append(self.ROUND_HEADER.pack(len(genre), len(sort_by), len(difficulty),
+                                                 len(round_.place_ids), len(round_.shelf_ids)))
+            chunks.append(genre + sort_by + difficulty)
+            chunks.append(struct.pack(f"<{len(ids)}I{len(round_.answers)}B", *ids, *round_.answers))
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(chunks))
+        os.replace(tmp_path, path)
+
+    def load(self, path):
+        """
+        Load banked rounds from a file, keeping only rounds that still validate
+        against the current catalog.
+
+        Returns:
+            int: Number of rounds loaded
+        """
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            magic, version, count = self.HEADER.unpack_from(data, 0)
+            if magic != self.MAGIC or version != self.VERSION:
+                return 0
+            offset = self.HEADER.size
+            loaded = 0
+            for _ in range(count):
+                genre_len, rule_len, difficulty_len, n_place, n_shelf = self.ROUND_HEADER.unpack_from(data, offset)
+                offset += self.ROUND_HEADER.size
+                genre = data[offset:offset + genre_len].decode("utf-8")
+                offset += genre_len
+                sort_by = data[offset:offset + rule_len].decode("utf-8")
+                offset += rule_len
+                difficulty = data[offset:offset + difficulty_len].decode("utf-8")
+                offset += difficulty_len
+                layout = struct.Struct(f"<{n_place + n_shelf}I{n_place}B")
+                values = layout.unpack_from(data, offset)
+                offset += layout.size
+
+                round_ = Round(genre, sort_by, values[:n_place], values[n_place:n_place + n_shelf],
+                               values[n_place + n_shelf:], difficulty)
+                if validate_round(round_, self.catalog):
+                    with self._lock:
+                        self._queue(genre, sort_by, difficulty).append(round_)
+                    loaded += 1
+            return loaded
+        except (OSError, struct.error, UnicodeDecodeError) as e:
+            print(f"[PuzzleBank] Could not load {path}: {e}")
+            return 0
@@ -0,0 +1,105 @@
+"""
+Shelf Index Module
+Keeps the books on a shelf in sorted order with a parallel array of sort keys
+Answers "which slot does this book belong in?" with a binary search
+"""
+
+from bisect import bisect_left, bisect_right
+
+from src.sort_rules import get_sort_rule
+
+
+class ShelfIndex:
+    """
+    Sorted shelf of (title, author, color) books.
+
+    `books` and `keys` are parallel lists kept in key order. Slot and rank
+    queries are binary searches over `keys`; insert/remove locate their
+    position the same way and shift the lists in place (a single memmove).
+    """
+
+    def __init__(self, books=(), sort_by='surname'):
+        """
+        Build the index from an unsorted collection of books.
+
+        Args:
+            books: Books to place on the shelf
+            sort_by (str): Name of a registered sort rule
+        """
+        self.sort_by = sort_by
+        self.rule = get_sort_rule(sort_by)
+        pairs = sorted(((self.rule.key(book), book) for book in books),
+                       key=lambda pair: pair[0])
+        self.keys = [key for key, _ in pairs]
+        self.books = [book for _, book in pairs]
+
+    def __len__(self):
+        return len(self.books)
+
+    def __iter__(self):
+        return iter(self.books)
+
+    def __getitem__(self, index):
+        return self.books[index]
+
+    def __contains__(self, book):
+        return self._find(book) is not None
+
+    def slot_for(self, book):
+        """
+        Return the correct slot for a new book.
+        Books with an equal key stay in front of the new one.
+
+        Returns:
+            int: Slot index between 0 and len(self)
+        """
+        return bisect_right(self.keys, self.rule.key(book))
+
+    def rank(self, book):
+        """
+        Return how many shelf books sort strictly before a book.
+
+        Returns:
+            int: Rank of the book's key on this shelf
+        """
+        return bisect_left(self.keys, self.rule.key(book))
+
+    def insert(self, book):
+        """
+        Insert a book at its correct slot.
+
+        Returns:
+            int: The slot the book was inserted at
+        """
+        key = self.rule.key(book)
+        slot = bisect_right(self.keys, key)
+        self.keys.insert(slot, key)
+        self.books.insert(slot, book)
+        return slot
+
+    def remove(self, book):
+        """
+        Remove a book from the shelf.
+
+        Returns:
+            int: The slot the book was removed from
+
+        Raises:
+            ValueError: If the book is not on the shelf
+        """
+        slot = self._find(book)
+        if slot is None:
+            raise ValueError(f"{book!r} is not on the shelf")
+        del self.keys[slot]
+        del self.books[slot]
+        return slot
+
+    def _find(self, book):
+        """Return the slot holding `book`, searching only its run of equal keys."""
+        key = self.rule.key(book)
+        start = bisect_left(self.keys, key)
+        stop = bisect_right(self.keys, key, lo=start)
+        for slot in range(start, stop):
+            if self.books[slot] == book:
+                return slot
+        return None
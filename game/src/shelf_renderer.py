@@ -0,0 +1,112 @@
+"""
+Shelf Renderer Module
+Optional single-layer shelf: every spine is composited into one off-screen
+PIL layer shown by one canvas image item. When books move (a gap opening
+during a drag, a book being shelved), only the changed horizontal span is
+re-rendered and copied into the Tk photo with `copy -to`
+"""
+
+from PIL import ImageTk
+
+from src.bookspines import render_shelf_layer
+
+
+SHELF_LAYER_TAG = "shelf_layer"
+
+
+def spine_of(book):
+    """Return the render tuple of a book_labels entry at its current position."""
+    return (book['current_x'], book['y'], book['width'], book['height'], book['color'],
+            book['title'], book['author'], book['font_size'])
+
+
+class ShelfRenderer:
+    """
+    Keeps the shelf as one RGBA layer spanning the canvas width from `top`
+    to `bottom`, so the number of Tk items stays at one however long the shelf is.
+    """
+
+    def __init__(self, canvas, width=1150, top=0, bottom=650):
+        """
+        Args:
+            canvas: Tk canvas to draw on
+            width (int): Layer width in pixels
+            top (int): Canvas y of the layer's first row
+            bottom (int): Canvas y just below the layer's last row
+        """
+        self.canvas = canvas
+        self.size = (width, bottom - top)
+        self.top = top
+        self.photo = None
+        self.item = None
+        self.spines = {}
+        self._dirty = []
+        self.full_renders = 0
+        self.span_renders = 0
+
+    def _alive(self):
+        """True if our canvas item still exists (next_book-style deletes remove it)."""
+        return self.item is not None and bool(self.canvas.type(self.item))
+
+    def _extent(self, spine):
+        return spine[0], spine[0] + spine[2]
+
+    def update(self, books):
+        """
+        Show a new arrangement of books (book_labels entries).
+        Only spans whose spines changed are re-rendered; a missing layer is rebuilt.
+        """
+        spines = {}
+        for book in books:
+            spines[(book['title'], book['author'])] = spine_of(book)
+        if not self._alive():
+            self.spines = spines
+            self._render_all()
+            return
+        for key in self.spines.keys() | spines.keys():
+            old, new = self.spines.get(key), spines.get(key)
+            if old != new:
+                self._dirty.extend(self._extent(spine) for spine in (old, new) if spine is not None)
+        self.spines = spines
+        self.flush()
+        self.canvas.tag_raise(self.item)
+
+    def move(self, book, x):
+        """Move one book (a book_labels entry) to canvas x; call flush() to show it."""
+        key = (book['title'], book['author'])
+        old = self.spines.get(key)
+        book['current_x'] = x
+        new = self.spines[key] = spine_of(book)
+        if old != new:
+            self._dirty.extend(self._extent(spine) for spine in (old, new) if spine is not None)
+
+    def flush(self):
+        """Re-render the union of all dirty spans and copy it into the layer's photo."""
+        if not self._dirty:
+            return
+        if not self._alive():
+            self._dirty = []
+            self._render_all()
+            return
+        width, height = self.size
+        x0 = max(0, min(start for start, _ in self._dirty))
+        x1 = min(width, max(stop for _, stop in self._dirty))
+        self._dirty = []
+        if x0 >= x1:
+            return
+        span = render_shelf_layer(self.spines.values(), (x1 - x0, height), origin=(x0, self.top))
+        span_photo = ImageTk.PhotoImage(span)
+        self.canvas.tk.call(str(self.photo), "copy", str(span_photo),
+                            "-to", x0, 0, "-compositingrule", "set")
+        self.span_renders += 1
+
+    def _render_all(self):
+        layer = render_shelf_layer(self.spines.values(), self.size, origin=(0, self.top))
+        self.photo = ImageTk.PhotoImage(layer)
+        if self._alive():
+            self.canvas.itemconfigure(self.item, image=self.photo)
+        else:
+            self.item = self.canvas.create_image(0, self.top, image=self.photo, anchor='nw',
+                                                 tags=SHELF_LAYER_TAG)
+        self.canvas.tag_raise(self.item)
+        self.full_renders += 1
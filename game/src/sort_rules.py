@@ -0,0 +1,152 @@
+"""
+Sort Rules Module
+Registry of shelf ordering rules (surname, first name, title, rank, ...)
+Each rule builds its key column once per catalog, so placement checks,
+shelf sorts and "correct order" listings only compare precomputed keys
+"""
+
+from src.catalog import get_catalog
+from src.names import author_sort_keys, fold_name
+
+
+LEADING_ARTICLES = ("the ", "a ", "an ")
+
+
+def title_sort_key(title):
+    """Fold a title for sorting, ignoring a leading article ("The Great Gatsby" -> "great gatsby")."""
+    folded = fold_name(title or "")
+    for article in LEADING_ARTICLES:
+        if folded.startswith(article):
+            return folded[len(article):]
+    return folded
+
+
+class SortRule:
+    """
+    A named shelf ordering.
+
+    `catalog_key(catalog, book_id)` builds the key of a catalog book and is
+    only called while filling the rule's key column. `book_key(book)` covers
+    (title, author, color) tuples that are not in the catalog.
+    """
+
+    def __init__(self, name, instruction, catalog_key, book_key, prefix_text=None):
+        """
+        Args:
+            name (str): Registry name, also used as LibraryGame.sort_method
+            instruction (str): How the shelf is sorted, for the instruction label
+            catalog_key (function): (catalog, book_id) -> key
+            book_key (function): (title, author, color) -> key
+            prefix_text (function): key -> the string players compare letter by
+                letter (used for difficulty tiers); defaults to the key itself or
+                its first element
+        """
+        self.name = name
+        self.instruction = instruction
+        self.catalog_key = catalog_key
+        self.book_key = book_key
+        if prefix_text is not None:
+            self.prefix_text = prefix_text
+
+    @staticmethod
+    def prefix_text(key):
+        """Return the string a player compares for this key."""
+        if isinstance(key, tuple):
+            key = key[0] if key else ""
+        return key if isinstance(key, str) else str(key)
+
+    def key_column(self, catalog=None):
+        """Return this rule's key for every catalog book, built once per catalog."""
+        catalog = catalog or get_catalog()
+        return catalog.key_column(
+            f"sort:{self.name}",
+            lambda cat: [self.catalog_key(cat, book_id) for book_id in range(len(cat))]
+        )
+
+    def key(self, book, catalog=None):
+        """Return the key of a (title, author, color) book."""
+        catalog = catalog or get_catalog()
+        book_id = catalog.book_id(book[0])
+        if book_id is not None and catalog.author(book_id) == book[1]:
+            return self.key_column(catalog)[book_id]
+        return self.book_key(book)
+
+
+SORT_RULES = {}
+
+
+def register_sort_rule(rule):
+    """
+    Add a rule to the registry (replacing any rule with the same name).
+
+    Returns:
+        SortRule: The registered rule
+    """
+    SORT_RULES[rule.name] = rule
+    return rule
+
+
+def get_sort_rule(name):
+    """
+    Look up a registered rule.
+
+    Raises:
+        ValueError: If no rule has that name
+    """
+    try:
+        return SORT_RULES[name]
+    except KeyError:
+        raise ValueError(f"Unknown sort rule: {name!r} (known: {', '.join(sorted(SORT_RULES))})")
+
+
+def key_ranks(sort_by='surname', catalog=None):
+    """
+    Return the dense rank of every catalog book's key, computed once per rule.
+    Books with equal keys share a rank.
+
+    Returns:
+        list: Rank per book ID
+    """
+    catalog = catalog or get_catalog()
+    rule = get_sort_rule(sort_by)
+
+    def build(cat):
+        keys = rule.key_column(cat)
+        position = {key: rank for rank, key in enumerate(sorted(set(keys)))}
+        return [position[key] for key in keys]
+
+    return catalog.key_column(f"rank:{rule.name}", build)
+
+
+# ----- Built-in rules -------------------------------------------------------------------
+
+register_sort_rule(SortRule(
+    'surname', "alphabetically by author's surname",
+    lambda catalog, book_id: catalog.name_keys(book_id)[0],
+    lambda book: author_sort_keys(book[1])[0],
+))
+
+register_sort_rule(SortRule(
+    'first_name', "alphabetically by author's first name",
+    lambda catalog, book_id: catalog.name_keys(book_id)[1],
+    lambda book: author_sort_keys(book[1])[1],
+))
+
+register_sort_rule(SortRule(
+    'title', "alphabetically by title",
+    lambda catalog, book_id: title_sort_key(catalog.book(book_id)[0]),
+    lambda book: title_sort_key(book[0]),
+))
+
+register_sort_rule(SortRule(
+    'rank', "by catalogue rank",
+    lambda catalog, book_id: catalog.rank(book_id),
+    lambda book: float('inf'),
+))
+
+register_sort_rule(SortRule(
+    'genre_surname', "by genre, then alphabetically by author's surname",
+    lambda catalog, book_id: (catalog.genre(book_id), catalog.name_keys(book_id)[0]),
+    lambda book: ("", author_sort_keys(book[1])[0]),
+    prefix_text=lambda key: key[1][0],
+))
@@ -0,0 +1,63 @@
+"""
+Spine Geometry Module
+Stable (width, height, font_size) per book, so a book's spine looks the same
+every round and shelf layout needs no text measurement during play
+"""
+
+import zlib
+
+from src.bookspines import calculate_book_dimensions
+from src.catalog import get_catalog
+
+
+SPINE_MIN_WIDTH = 60
+SPINE_MAX_WIDTH = 90
+
+
+def spine_width(title):
+    """Return a spine width between SPINE_MIN_WIDTH and SPINE_MAX_WIDTH derived from the title."""
+    span = SPINE_MAX_WIDTH - SPINE_MIN_WIDTH + 1
+    return SPINE_MIN_WIDTH + zlib.crc32(title.encode("utf-8")) % span
+
+
+def solve_spine_geometry(title, author):
+    """
+    Returns:
+        tuple: (width, height, font_size) of a book's spine
+    """
+    width = spine_width(title)
+    height, font_size = calculate_book_dimensions(title, author, width)
+    return width, height, font_size
+
+
+def spine_geometry_table(genre, catalog=None):
+    """
+    Return {book_id: (width, height, font_size)} for a genre, built once per catalog.
+    """
+    catalog = catalog or get_catalog()
+    genre = genre.lower()
+
+    def build(cat):
+        table = {}
+        for book_id in cat.ids_by_genre(genre):
+            title, author, _ = cat.book(book_id)
+            table[book_id] = solve_spine_geometry(title, author)
+        return table
+
+    return catalog.derived(f"spines:{genre}", build)
+
+
+def book_spine_geometry(book, catalog=None):
+    """
+    Look up the spine geometry of a (title, author, color) book, solving it
+    directly for books that are not in the catalog.
+
+    Returns:
+        tuple: (width, height, font_size)
+    """
+    catalog = catalog or get_catalog()
+    title, author = book[0], book[1]
+    book_id = catalog.book_id(title)
+    if book_id is not None and catalog.author(book_id) == author:
+        return spine_geometry_table(catalog.genre(book_id), catalog)[book_id]
+    return solve_spine_geometry(title, author)
@@ -0,0 +1,627 @@
+import io
+import itertools
+import random
+import json
+import shutil
+import subprocess
+import sys
+from unittest.mock import MagicMock
+import os
+import tkinter as tk
+
+import numpy as np
+import pytest
+from PIL import Image, ImageChops, ImageDraw
+
+from library_game_logic import (
+    load_books_by_genre, get_author_surname, get_author_first_name,
+    sort_books_by_surname, sort_books_by_first_name, check_book_position,
+    grade_orderings_file, stream_books_by_genre, sort_books
+)
+from src.catalog import BookCatalog, get_catalog, GAME_IMAGES_JSON, BOOK_COVERS_DIR
+from src.names import parse_author_name
+from src.shelf_index import ShelfIndex
+from src.grading import count_inversions, grade_orderings
+from src.catalog_binary import MappedCatalog, compile_catalog
+from src.sort_rules import SortRule, register_sort_rule, get_sort_rule, key_ranks, SORT_RULES
+from src.rounds import PuzzleBank, generate_round, validate_round
+from src.neighbours import neighbour_index
+from src.cover_cache import CoverCache
+from src.cover_prefetch import CoverPrefetcher
+from src.cover_atlas import CoverAtlas, bake_atlas
+from src.drag_logic import DragManager
+from src import shelf_renderer as shelf_renderer_module
+from src.shelf_renderer import ShelfRenderer
+from src.gamebackground import MipmapPyramid, get_pyramid, preload_pyramids
+from src.resize_scheduler import ResizeScheduler, FAST_RESAMPLE, FINAL_RESAMPLE
+from src.end_screen import compose_end_background, layer_paths, legacy_background_name
+from src.notifications import SpriteRegistry, show_geese_popup_overlay
+from src.fonts import resolve_font, get_font
+from src.spine_geometry import book_spine_geometry, spine_geometry_table, SPINE_MIN_WIDTH, SPINE_MAX_WIDTH
+from src.bookspines import calculate_book_dimensions, spine_body_array, render_book_spine, render_shelf_layer
+from src.catalog_stream import iter_json_array, write_genre_file, iter_books_by_genre
+
+
+# Small in-memory catalog in the game_images.json schema
+@pytest.fixture
+def small_catalog():
+    records = [
+        {"title": "Dare Me", "Genre": "Thriller", "author first name": "Megan", "author surname": "Abbott", "rank": 1},
+        {"title": "Emma", "Genre": "Classic", "author first name": "Jane", "author surname": "Austen", "rank": 3},
+        {"title": "Beach Read", "Genre": "Romance", "author first name": "Emily", "author surname": "Henry", "rank": 2},
+        {"title": "Persuasion", "Genre": "Classic", "author first name": "Jane", "author surname": "Austen", "rank": 2},
+    ]
+    cover_paths = {"Emma": "game_images/Emma.jpg"}
+    return BookCatalog(records, cover_paths)
+
+# Test 1: Books are grouped by genre in rank order with stable integer IDs
+def test_catalog_genre_lookup(small_catalog):
+    assert len(small_catalog) == 4
+    assert small_catalog.books_by_genre('classic') == [
+        ("Persuasion", "Jane Austen", "#e8d5b7"),
+        ("Emma", "Jane Austen", "#e8d5b7"),
+    ]
+    assert small_catalog.books_by_genre('Thriller') == [("Dare Me", "Megan Abbott", "#3d2817")]
+    assert small_catalog.books_by_genre('fantasy') == []
+
+    emma_id = small_catalog.book_id("Emma")
+    assert emma_id in small_catalog.ids_by_genre('classic')
+    assert small_catalog.book(emma_id) == ("Emma", "Jane Austen", "#e8d5b7")
+    assert small_catalog.book_id("Unknown") is None
+
+# Test 2: Title -> cover lookups come from local_game_images.json
+def test_catalog_cover_path(small_catalog):
+    assert small_catalog.cover_path("Emma") == "game_images/Emma.jpg"
+    assert small_catalog.cover_path("Dare Me") is None
+
+# Test 3: The shipped catalog is loaded once and joined with its covers
+def test_load_books_by_genre_uses_shared_catalog():
+    assert get_catalog() is get_catalog()
+    books = load_books_by_genre('classic')
+    assert books
+    assert all(color == "#e8d5b7" for _, _, color in books)
+    assert all(get_catalog().cover_path(title) for title, _, _ in books)
+
+# Test 4: Surname particles and suffixes are parsed correctly
+def test_get_author_surname_particles():
+    assert get_author_surname("Jane Austen") == "Austen"
+    assert get_author_surname("Ursula K. Le Guin") == "Le Guin"
+    assert get_author_surname("Daphne du Maurier") == "du Maurier"
+    assert get_author_surname("Martin Luther King Jr.") == "King"
+    assert get_author_surname("Plato") == "Plato"
+    assert parse_author_name("Austen, Jane") == ("Jane", "Austen", "")
+
+# Test 5: First names ignore the surname particles
+def test_get_author_first_name():
+    assert get_author_first_name("F. Scott Fitzgerald") == "F."
+    assert get_author_first_name("Ursula K. Le Guin") == "Ursula"
+    assert get_author_first_name("Plato") == "Plato"
+
+# Test 6: Sorting is accent- and case-insensitive and uses the parsed surname
+def test_sort_books_collation():
+    books = [
+        ("Rebecca", "Daphne du Maurier", "#e8d5b7"),
+        ("Love in the Time of Cholera", "Gabriel García Márquez", "#e8d5b7"),
+        ("The Dispossessed", "Ursula K. Le Guin", "#e8d5b7"),
+        ("Emma", "jane austen", "#e8d5b7"),
+    ]
+    assert [b[0] for b in sort_books_by_surname(books)] == [
+        "Emma", "Rebecca", "The Dispossessed", "Love in the Time of Cholera"
+    ]
+    assert [b[0] for b in sort_books_by_first_name(books)] == [
+        "Rebecca", "Love in the Time of Cholera", "Emma", "The Dispossessed"
+    ]
+
+SHELF = [
+    ("Persuasion", "Jane Austen", "#e8d5b7"),
+    ("Jane Eyre", "Charlotte Brontë", "#e8d5b7"),
+    ("Great Expectations", "Charles Dickens", "#e8d5b7"),
+    ("Rebecca", "Daphne du Maurier", "#e8d5b7"),
+]
+
+# Test 7: check_book_position agrees for plain lists and ShelfIndex
+def test_check_book_position():
+    new_book = ("The Great Gatsby", "F. Scott Fitzgerald", "#e8d5b7")
+    assert check_book_position(new_book, SHELF) == 4
+    assert check_book_position(new_book, ShelfIndex(SHELF)) == 4
+    first = ("Animal Farm", "George Orwell", "#e8d5b7")
+    assert check_book_position(first, SHELF, sort_by='first_name') == 3
+    assert check_book_position(first, ShelfIndex(SHELF, 'first_name'), sort_by='first_name') == 3
+    assert check_book_position(new_book, []) == 0
+
+# Test 8: ShelfIndex keeps books sorted through inserts and removals
+def test_shelf_index_insert_remove():
+    shelf = ShelfIndex(reversed(SHELF))
+    assert shelf.books == SHELF
+    emma = ("Emma", "Jane Austen", "#e8d5b7")
+    assert shelf.slot_for(emma) == 1
+    assert shelf.rank(emma) == 0
+    assert shelf.insert(emma) == 1
+    assert shelf.books[:2] == [SHELF[0], emma]
+    assert emma in shelf
+    assert shelf.remove(SHELF[0]) == 0
+    assert shelf.books[0] == emma
+    with pytest.raises(ValueError):
+        shelf.remove(SHELF[0])
+
+# Test 9: Vectorized inversion counts match a brute-force count, ties excluded
+def test_count_inversions():
+    rows = np.array([list(p) for p in itertools.permutations([0, 1, 1, 2, 3])])
+    expected = [sum(1 for i, j in itertools.combinations(range(5), 2) if row[i] > row[j]) for row in rows]
+    assert count_inversions(rows).tolist() == expected
+
+# Test 10: Batch grading reads CSV and JSONL and awards partial credit
+def test_grade_orderings_file(tmp_path):
+    classics = sort_books_by_surname(load_books_by_genre('classic'))
+    titles = [classics[0][0], classics[5][0], classics[10][0], classics[15][0]]
+    csv_path = tmp_path / "attempts.csv"
+    csv_path.write_text("alice," + ",".join(titles) + "\n" + "bob," + ",".join(reversed(titles)) + "\n")
+    results = grade_orderings_file(str(csv_path))
+    assert [(r['id'], r['exact'], r['inversions'], r['score']) for r in results] == [
+        ("alice", True, 0, 1.0), ("bob", False, 6, 0.0)
+    ]
+
+    jsonl_path = tmp_path / "attempts.jsonl"
+    jsonl_path.write_text(json.dumps({"id": "carol", "order": [titles[1], titles[0], titles[2]]}) + "\n"
+                          + json.dumps({"id": "dave", "order": ["Not A Book"]}) + "\n")
+    carol, dave = grade_orderings_file(str(jsonl_path))
+    assert carol['inversions'] == 1 and carol['score'] == pytest.approx(2 / 3)
+    assert dave['valid'] is False
+
+# Test 11: The compiled binary catalog answers exactly like the JSON catalog
+def test_mapped_catalog_matches_json(tmp_path):
+    out_path = str(tmp_path / "catalog.bin")
+    json_catalog = BookCatalog.from_json()
+    assert compile_catalog(out_path) == len(json_catalog)
+
+    mapped = MappedCatalog(out_path)
+    try:
+        assert len(mapped) == len(json_catalog)
+        for genre in ('classic', 'romance', 'thriller'):
+            assert mapped.books_by_genre(genre) == json_catalog.books_by_genre(genre)
+        for book_id in range(len(json_catalog)):
+            title = json_catalog.book(book_id)[0]
+            assert mapped.book_id(title) == book_id
+            assert mapped.cover_path(title) == json_catalog.cover_path(title)
+            assert mapped.name_keys(book_id) == json_catalog.name_keys(book_id)
+        assert mapped.book_id("Not A Book") is None
+    finally:
+        mapped.close()
+
+# Test 12: The incremental parser handles elements split across tiny reads
+def test_iter_json_array_small_chunks():
+    data = [{"title": "A, [tricky] \"one\"", "n": 12345}, [1, 2], "x", 678]
+    parsed = list(iter_json_array(io.StringIO(json.dumps(data)), chunk_size=3))
+    assert parsed == data
+    assert list(iter_json_array(io.StringIO("  [ ]  "))) == []
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[{"a": 1}')))
+
+# Test 13: Streaming a genre matches the catalog, with or without a pre-filtered file
+def test_stream_books_by_genre(tmp_path):
+    assert sorted(stream_books_by_genre('romance')) == sorted(load_books_by_genre('romance'))
+
+    source = tmp_path / "game_images.json"
+    shutil.copy(GAME_IMAGES_JSON, source)
+    assert write_genre_file('classic', path=str(source)) == len(load_books_by_genre('classic'))
+    assert (tmp_path / "game_images.classic.json").exists()
+    assert sorted(iter_books_by_genre('classic', path=str(source))) == sorted(load_books_by_genre('classic'))
+
+# Test 14: Built-in rules sort by title (ignoring articles) and by catalogue rank
+def test_sort_rules_title_and_rank():
+    books = [
+        ("The Great Gatsby", "F. Scott Fitzgerald", "#e8d5b7"),
+        ("Animal Farm", "George Orwell", "#e8d5b7"),
+        ("A Clockwork Orange", "Anthony Burgess", "#e8d5b7"),
+    ]
+    assert [b[0] for b in sort_books(books, 'title')] == ["Animal Farm", "A Clockwork Orange", "The Great Gatsby"]
+
+    catalog = get_catalog()
+    classics = load_books_by_genre('classic')
+    ranked = sort_books(list(reversed(classics)), 'rank')
+    assert [catalog.rank(catalog.book_id(title)) for title, _, _ in ranked] == sorted(
+        catalog.rank(book_id) for book_id in catalog.ids_by_genre('classic'))
+    with pytest.raises(ValueError):
+        get_sort_rule('colour')
+
+# Test 15: A registered rule builds its key column once and drives ShelfIndex
+def test_register_sort_rule_builds_column_once():
+    calls = []
+
+    def catalog_key(catalog, book_id):
+        calls.append(book_id)
+        return -catalog.rank(book_id)
+
+    register_sort_rule(SortRule('rank_desc', "by rank, highest first", catalog_key, lambda book: 0))
+    try:
+        classics = load_books_by_genre('classic')
+        shelf = ShelfIndex(classics, sort_by='rank_desc')
+        sort_books(classics, 'rank_desc')
+        check_book_position(classics[0], shelf, sort_by='rank_desc')
+        assert len(calls) == len(get_catalog())
+        assert shelf.books == sorted(classics, key=lambda b: -get_catalog().rank(get_catalog().book_id(b[0])))
+    finally:
+        del SORT_RULES['rank_desc']
+
+# Test 16: Generated rounds are distinct in-genre books with correct answers
+def test_generate_round_answers():
+    catalog = get_catalog()
+    round_ = generate_round('thriller', rng=random.Random(7))
+    assert len(round_.place_ids) == 5 and len(round_.shelf_ids) == 4
+    assert len(set(round_.place_ids + round_.shelf_ids)) == 9
+    assert all(book_id in catalog.ids_by_genre('thriller') for book_id in round_.place_ids)
+
+    shelf = ShelfIndex([catalog.book(book_id) for book_id in round_.shelf_ids])
+    assert shelf.books == [catalog.book(book_id) for book_id in round_.shelf_ids]
+    for book_id, answer in zip(round_.place_ids, round_.answers):
+        assert shelf.insert(catalog.book(book_id)) == answer
+    assert validate_round(round_)
+    assert not validate_round(round_._replace(answers=(0, 0, 0, 0, 0)))
+
+# Test 17: The puzzle bank serves banked rounds and round-trips through its file
+def test_puzzle_bank_save_load(tmp_path):
+    path = str(tmp_path / "bank.bin")
+    bank = PuzzleBank(path=None, per_key=3)
+    assert bank.fill('romance') == 3
+    first = bank.peek('romance')
+    assert bank.take('romance') == first
+    bank.save(path)
+
+    reloaded = PuzzleBank(path=path, per_key=3)
+    assert len(reloaded) == 2
+    assert reloaded.take('romance') == bank.take('romance')
+    # An empty bank still serves a freshly generated round
+    assert len(reloaded.take('classic').place_ids) == 5
+
+# Test 18: Neighbour index prefix ranges and difficulty-tiered draws
+def test_neighbour_index_difficulty():
+    catalog = get_catalog()
+    index = neighbour_index('classic')
+    assert index.texts == sorted(index.texts)
+    lo, hi = index.prefix_range(index.texts[0][:1])
+    assert lo == 0 and all(text.startswith(index.texts[0][:1]) for text in index.texts[lo:hi])
+    assert index.texts[hi:hi + 1] == [] or not index.texts[hi].startswith(index.texts[0][:1])
+
+    rng = random.Random(3)
+    easy = index.easy_ids(5, rng)
+    assert len({index.texts[index.ids.index(book_id)][0] for book_id in easy}) == 5
+    cluster_lo, cluster_hi = max(index.clusters, key=lambda run: run[1] - run[0])
+    hard = index.hard_ids(cluster_hi - cluster_lo, rng)
+    assert len({index.texts[index.ids.index(book_id)][:3] for book_id in hard}) == 1
+
+    for difficulty in ('easy', 'hard'):
+        round_ = generate_round('classic', rng=rng, difficulty=difficulty)
+        assert round_.difficulty == difficulty and validate_round(round_, catalog)
+    with pytest.raises(ValueError):
+        generate_round('classic', difficulty='impossible')
+
+# Test 19: The cover cache evicts least recently used covers past its budget
+def test_cover_cache_lru():
+    size = (10, 10)
+    cache = CoverCache(budget_bytes=2 * 10 * 10 * 3)
+    loads = []
+
+    def loader(title):
+        loads.append(title)
+        return Image.new('RGB', size)
+
+    for title in ("A", "B", "A", "C"):
+        cache.get_or_load(title, size, lambda: loader(title))
+    assert loads == ["A", "B", "C"]
+    assert ("A", size) in cache and ("B", size) not in cache
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 3, 1)
+    assert stats['bytes'] <= stats['budget']
+
+# Test 20: Prefetched covers reach the cache through the polled queue
+def test_cover_prefetcher_fills_cache():
+    scheduled = []
+
+    class FakeRoot:
+        def after(self, ms, callback):
+            scheduled.append(callback)
+
+    cache = CoverCache()
+    size = (8, 12)
+    prefetcher = CoverPrefetcher(FakeRoot(), cache,
+                                 lambda title, author, color, size: Image.new('RGB', size, color))
+    books = [("A", "Ann", "#ff0000"), ("B", "Bob", "#00ff00")]
+    assert prefetcher.prefetch(books, size) == 2
+    assert prefetcher.prefetch(books, size) == 0
+    assert prefetcher.wait("A", size).size == size
+
+    while scheduled:
+        prefetcher._executor.shutdown(wait=True)
+        scheduled.pop()()
+    assert ("A", size) in cache and ("B", size) in cache
+    assert prefetcher.prefetch(books, size) == 0
+
+# Test 21: The atlas bake packs display-size tiles and indexes them by title
+def test_cover_atlas_bake(tmp_path):
+    catalog = BookCatalog.from_json()
+    titles = [title for title in (catalog.book(0)[0], catalog.book(len(catalog) - 1)[0]) if catalog.cover_path(title)]
+    os.makedirs(tmp_path / "game_images")
+    local_images = {}
+    for title in titles:
+        cover_path = catalog.cover_path(title)
+        shutil.copy(os.path.join(BOOK_COVERS_DIR, cover_path), tmp_path / cover_path)
+        local_images[title] = {"Local_Path": cover_path}
+    local_images_path = tmp_path / "local_game_images.json"
+    local_images_path.write_text(json.dumps(local_images), encoding="utf-8")
+
+    out_dir = str(tmp_path / "atlas")
+    assert bake_atlas(out_dir, size=(20, 30), local_images_path=str(local_images_path)) == len(titles)
+    atlas = CoverAtlas(os.path.join(out_dir, "atlas_index.json"))
+    assert atlas.tile_size == (20, 30) and len(atlas) == len(titles)
+    assert all(atlas.cover(title).size == (20, 30) for title in titles)
+    assert atlas.cover("Not A Real Book") is None
+
+# Test 22: Drag hover slides spines with canvas.move instead of re-rendering them
+def test_drag_hover_moves_spines():
+    game = MagicMock()
+    game.hovered_slot = None
+    game.selected_slot = None
+    game.shelf_renderer = None
+    game.drag_book_info = {'width': 268}
+    game.book_labels = [{'index': i, 'original_x': 100 * i, 'current_x': 100 * i} for i in range(3)]
+    drag = DragManager(game)
+    drag.dragging = True
+
+    drag.on_slot_hover(1)
+    assert [book['current_x'] for book in game.book_labels] == [0, 368, 468]
+    game.main_canvas.move.assert_any_call("book_2", 268, 0)
+    assert game.main_canvas.move.call_count == 2
+    drag.on_slot_leave()
+    assert [book['current_x'] for book in game.book_labels] == [0, 100, 200]
+    assert game.main_canvas.move.call_count == 4
+    game.draw_book_spine.assert_not_called()
+
+# Test 23: Fonts resolve once per face and are cached per (face, size)
+def test_font_resolver_caches_fonts():
+    assert get_font('bold', 18) is get_font('bold', 18)
+    assert get_font('bold', 18) is not get_font('bold', 19)
+    assert resolve_font('oblique') is resolve_font('oblique')
+    assert get_font('regular', 24).getlength("Dewey") > get_font('regular', 12).getlength("Dewey")
+
+# Test 24: Spine geometry is stable per book and matches the text-fit solver
+def test_spine_geometry_table_is_stable():
+    catalog = get_catalog()
+    table = spine_geometry_table('romance')
+    assert set(table) == set(catalog.ids_by_genre('romance'))
+    assert spine_geometry_table('romance') is table
+    for book_id, (width, height, font_size) in table.items():
+        title, author, color = catalog.book(book_id)
+        assert SPINE_MIN_WIDTH <= width <= SPINE_MAX_WIDTH
+        assert calculate_book_dimensions(title, author, width) == (height, font_size)
+        assert book_spine_geometry((title, author, color)) == (width, height, font_size)
+    assert book_spine_geometry(("Unlisted", "Ann Author", "#cccccc"))[0] >= SPINE_MIN_WIDTH
+
+# Test 25: NumPy spine bodies match the rectangle shading; batch layers match single spines
+def test_spine_body_matches_rectangle_shading():
+    width, height, color = 70, 340, "#3d2817"
+    expected = Image.new('RGB', (width, height), color)
+    draw = ImageDraw.Draw(expected)
+    for i in range(10):
+        draw.rectangle([i, 0, i + 1, height], fill="#0b0000")
+    for i in range(10):
+        draw.rectangle([width - i - 1, 0, width - i, height], fill="#6f5a49")
+    draw.rectangle([8, 8, width - 8, 22], fill="#6f5a49")
+    draw.rectangle([0, 0, width - 1, height - 1], outline='black', width=3)
+    assert ImageChops.difference(Image.fromarray(spine_body_array(width, height, color)), expected).getbbox() is None
+
+    spines = [(10 + 80 * i, 20, width, height, color, f"Book {i}", "Ann Author", 16) for i in range(3)]
+    layer = render_shelf_layer(spines, (300, 400))
+    assert layer.mode == 'RGBA' and layer.getpixel((0, 0))[3] == 0
+    single = render_book_spine(width, height, color, "Book 1", "Ann Author", 16)
+    crop = layer.crop((90, 20, 90 + width, 20 + height)).convert('RGB')
+    assert ImageChops.difference(crop, single).getbbox() is None
+
+# Test 26: The shelf layer re-renders only the span of books that moved
+def test_shelf_renderer_dirty_spans(monkeypatch):
+    photos = []
+
+    class FakePhoto:
+        def __init__(self, image):
+            self.image = image
+            photos.append(self)
+
+    monkeypatch.setattr(shelf_renderer_module.ImageTk, "PhotoImage", FakePhoto)
+    canvas = MagicMock()
+    canvas.type.return_value = "image"
+    books = [{'index': i, 'original_x': 100 + 80 * i, 'current_x': 100 + 80 * i, 'y': 150,
+              'width': 70, 'height': 380, 'color': "#ffb6c1", 'title': f"Book {i}",
+              'author': "Ann Author", 'font_size': 16} for i in range(6)]
+    renderer = ShelfRenderer(canvas, 1150, 0, 530)
+    renderer.update(books)
+    assert renderer.full_renders == 1 and canvas.create_image.call_count == 1
+
+    for book in books[4:]:
+        renderer.move(book, book['original_x'] + 268)
+    renderer.flush()
+    assert renderer.span_renders == 1 and renderer.full_renders == 1
+    _, command, _, _, x0, _, *_ = canvas.tk.call.call_args[0]
+    assert command == "copy" and x0 == books[4]['original_x']
+    expected = render_shelf_layer([shelf_renderer_module.spine_of(book) for book in books], (1150, 530))
+    span = photos[-1].image
+    assert span.width == books[5]['current_x'] + 70 - x0
+    assert ImageChops.difference(span, expected.crop((x0, 0, x0 + span.width, 530))).getbbox() is None
+
+    # A layer deleted from the canvas is rebuilt in full
+    canvas.type.return_value = ""
+    renderer.update(books)
+    assert renderer.full_renders == 2
+
+# Test 27: The background pyramid scales from the nearest larger level and caches results
+def test_mipmap_pyramid_levels():
+    pyramid = MipmapPyramid(Image.new('RGB', (1150, 650), "#8b4513"))
+    assert [level.size for level in pyramid.levels] == [(1150, 650), (575, 325), (288, 163)]
+    assert pyramid.level_for((500, 300)).size == (575, 325)
+    assert pyramid.level_for((2000, 1000)).size == (1150, 650)
+    assert pyramid.scaled((1150, 650)) is pyramid.levels[0]
+    scaled = pyramid.scaled((400, 200))
+    assert scaled.size == (400, 200) and pyramid.scaled((400, 200)) is scaled
+
+# Test 28: Configure bursts coalesce into one fast redraw and one final redraw of one item
+def test_resize_scheduler_coalesces(monkeypatch):
+    monkeypatch.setattr("src.resize_scheduler.ImageTk.PhotoImage", lambda image: image)
+    root = MagicMock()
+    idle, timers = [], {}
+    root.after_idle.side_effect = lambda callback: idle.append(callback) or "idle"
+    root.after.side_effect = lambda ms, callback: timers.__setitem__(len(timers), callback) or len(timers) - 1
+    canvas = MagicMock()
+    canvas.create_image.return_value = 7
+    canvas.type.return_value = "image"
+    layouts = []
+    resizer = ResizeScheduler(root, canvas, MipmapPyramid(Image.new('RGB', (800, 600))),
+                              on_layout=lambda width, height: layouts.append((width, height)))
+
+    for width in (500, 510, 520):
+        resizer.schedule(type('event', (object,), {'width': width, 'height': 400}))
+    assert len(idle) == 1 and root.after_cancel.call_count == 2
+    idle.pop()()
+    assert resizer.rendered == ((520, 400), FAST_RESAMPLE)
+    timers[max(timers)]()
+    assert resizer.rendered == ((520, 400), FINAL_RESAMPLE)
+    assert canvas.create_image.call_count == 1 and canvas.itemconfigure.call_count == 1
+    assert layouts == [(520, 400), (520, 400)]
+
+    # Settled size: further events for the same size are ignored
+    resizer.schedule(type('event', (object,), {'width': 520, 'height': 400}))
+    assert idle == []
+
+# Test 29: Preloaded slides are decoded and pre-scaled in the shared pyramid cache
+def test_preload_pyramids(tmp_path):
+    paths = []
+    for index in range(2):
+        path = str(tmp_path / f"slide{index}.png")
+        Image.new('RGB', (640, 480), (index, 0, 0)).save(path)
+        paths.append(path)
+    preload_pyramids(paths, (320, 200)).join()
+    for path in paths:
+        pyramid = get_pyramid(path)
+        assert pyramid is get_pyramid(str(tmp_path / ".." / tmp_path.name / os.path.basename(path)))
+        assert pyramid._levels is not None
+        assert (((320, 200), Image.Resampling.LANCZOS)) in pyramid._scaled
+
+# Test 30: End-screen backgrounds are composited from a base and per-genre overlays
+def test_compose_end_background(tmp_path):
+    Image.new('RGB', (400, 300), (200, 200, 200)).save(tmp_path / "base.png")
+    for genre, box in (('classic', (0, 0, 100, 100)), ('romance', (300, 200, 400, 300))):
+        overlay = Image.new('RGBA', (400, 300), (0, 0, 0, 0))
+        ImageDraw.Draw(overlay).rectangle(box, fill=(255, 0, 0, 255))
+        overlay.save(tmp_path / f"overlay_{genre}.png")
+    progress = {'classic': {'completed': True, 'score': 50},
+                'romance': {'completed': True, 'score': 40},
+                'thriller': {'completed': False, 'score': 0}}
+
+    img = compose_end_background(progress, (200, 150), layers_dir=str(tmp_path))
+    assert img.size == (200, 150) and img.mode == 'RGB'
+    assert img.getpixel((10, 10)) == (255, 0, 0)
+    assert img.getpixel((190, 140)) == (255, 0, 0)
+    assert img.getpixel((100, 75)) == (200, 200, 200)
+    assert compose_end_background(progress, (200, 150), layers_dir=str(tmp_path)) is img
+
+    # A missing overlay means the pre-rendered PNGs are used instead
+    progress['thriller']['completed'] = True
+    assert layer_paths(('classic', 'romance', 'thriller'), str(tmp_path)) is None
+    assert legacy_background_name(('classic', 'romance', 'thriller')) == "library_all_clean"
+    assert legacy_background_name(()) == "library_all_messy"
+
+# Test 31: Popup sprites are decoded once; warm-up loads them before the first popup
+def test_sprite_registry(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.notifications.ImageTk.PhotoImage", lambda image: image)
+    Image.new('RGBA', (600, 500), (0, 128, 0, 255)).save(tmp_path / "good.png")
+    registry = SpriteRegistry({'good': ("good.png", (180, 180)), 'bad': ("bad.png", (160, 160))},
+                              sprites_dir=str(tmp_path))
+    root = MagicMock()
+    registry.warm_up(root)
+    root.after_idle.call_args[0][0]()
+
+    good = registry.photo('good')
+    assert good.size == (180, 180) and registry.photo('good') is good
+    assert registry.photo('bad') is None  # missing file: emoji fallback, not retried
+    assert registry.stats() == {'loaded': ['good'], 'hits': 3, 'misses': 0}
+
+# Test 32: Popups are built once per canvas and then only shown and hidden
+def test_popup_overlay_toggles_state():
+    canvas, root = MagicMock(spec=tk.Canvas), MagicMock()
+    canvas.winfo_width.return_value = 1150
+    canvas.winfo_height.return_value = 650
+    canvas.create_rectangle.side_effect = range(100, 200)
+    canvas.create_text.side_effect = range(200, 300)
+    canvas.type.return_value = "rectangle"
+    closed = []
+
+    for score in (10, 20):
+        show_geese_popup_overlay(canvas, root, score, "Perfect!", on_close=lambda: closed.append(score))
+        canvas.itemconfigure.assert_any_call("popup_geese", state="normal")
+        canvas.itemconfigure.assert_any_call(canvas._popup_overlays['geese'].items['score'], text=f"Score: {score}")
+        root.bind.call_args[0][1]()
+        root.bind.call_args[0][1]()  # a second Enter does nothing
+    assert closed == [10, 20]
+    assert canvas._popup_overlays['geese'].builds == 1
+    assert canvas.create_rectangle.call_count == 2
+    canvas.update_idletasks.assert_not_called()
+
+    # Deleted items (e.g. a cleared canvas) are rebuilt on the next show
+    canvas.type.return_value = ""
+    show_geese_popup_overlay(canvas, root, 30)
+    assert canvas._popup_overlays['geese'].builds == 2
+
+# Test 33: Importing the game does not import the gameplay-only subsystems
+def test_startup_imports_are_lazy():
+    game_dir = os.path.dirname(os.path.abspath(__file__))
+    code = ("import sys, project; "
+            "print(sorted(name for name in ('numpy', 'src.bookspines', 'src.catalog', 'src.drag_logic', "
+            "'src.end_screen', 'src.notifications') if name in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=game_dir, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+# Test 34: The database's own surname field decides where a book is shelved
+def test_catalog_uses_structured_surname():
+    catalog = BookCatalog([
+        {"title": "The Sun Down Motel", "Genre": "Thriller", "rank": 1,
+         "author first name": "Simone St.", "author surname": "James"},
+        {"title": "The Left Hand of Darkness", "Genre": "Thriller", "rank": 2,
+         "author first name": "Ursula K.", "author surname": "Le Guin"},
+    ])
+    assert catalog.name_keys(0)[0] == ("james", "simone st")
+    assert catalog.name_keys(1)[0] == ("le guin", "ursula k")
+
+# Test 35: Every catalog consumer works unchanged on a compiled MappedCatalog
+def test_consumers_on_mapped_catalog(tmp_path):
+    out_path = str(tmp_path / "catalog.bin")
+    compile_catalog(out_path)
+    json_catalog = BookCatalog.from_json()
+    mapped = MappedCatalog(out_path)
+    try:
+        for name, rule in SORT_RULES.items():
+            assert rule.key_column(mapped) == rule.key_column(json_catalog)
+            assert key_ranks(name, mapped) == key_ranks(name, json_catalog)
+        for genre in ('classic', 'romance', 'thriller'):
+            assert neighbour_index(genre, 'surname', mapped).texts == neighbour_index(genre, 'surname', json_catalog).texts
+            assert spine_geometry_table(genre, mapped) == spine_geometry_table(genre, json_catalog)
+            for difficulty in ('easy', 'normal', 'hard'):
+                round_ = generate_round(genre, rng=random.Random(3), catalog=mapped, difficulty=difficulty)
+                assert validate_round(round_, mapped)
+        titles = [mapped.book(book_id)[0] for book_id in mapped.ids_by_genre('classic')][:4]
+        assert grade_orderings([("a", titles)], catalog=mapped) == grade_orderings([("a", titles)], catalog=json_catalog)
+    finally:
+        mapped.close()
+
+# Test 36: Pending resize redraws are cancelled with their screen and never touch a dead canvas
+def test_resize_scheduler_cancel():
+    root, canvas = MagicMock(), MagicMock()
+    root.after_idle.return_value = "idle"
+    root.after.return_value = "final"
+    layouts = []
+    resizer = ResizeScheduler(root, canvas, MipmapPyramid(Image.new('RGB', (800, 600))),
+                              on_layout=lambda width, height: layouts.append((width, height)))
+    resizer.schedule(type('event', (object,), {'width': 500, 'height': 400}))
+    resizer.cancel()
+    assert {call.args[0] for call in root.after_cancel.call_args_list} == {"idle", "final"}
+
+    canvas.winfo_exists.return_value = False
+    resizer.render()
+    canvas.create_image.assert_not_called()
+    assert layouts == []